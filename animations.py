@@ -0,0 +1,256 @@
+"""
+General Relativity Animations - Streaming Export
+================================================
+Long animations of gravitational waves and precessing orbits, streamed frame by frame.
+
+A scene builds its figure and artists once and returns an `update(i)`
+callback that only changes artist data. Frames are rendered with blitting
+(the static background is rasterised once and restored each frame; only
+the animated artists are redrawn) and streamed straight to a writer:
+
+- ffmpeg, when it is on PATH, through a raw RGBA pipe (.mp4, .webm, .gif, ...)
+- otherwise a PNG sequence in a directory, or a palettised GIF for .gif
+
+so memory use does not grow with the number of frames. The exception is
+the GIF fallback: Pillow encodes a GIF in one pass on close, so it keeps
+every frame (1 byte per pixel) until then and refuses animations larger
+than GIF_MAX_BYTES. The writer reports the path it actually wrote, which
+for the PNG-sequence fallback is a directory rather than the file asked for.
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import time
+
+import numpy as np
+import matplotlib
+import matplotlib.pyplot as plt
+from PIL import Image
+
+import geodesics
+
+GIF_MAX_BYTES = 512 * 2**20   # palettised frames the GIF fallback may hold before saving
+
+
+class FFmpegWriter:
+    """Pipe raw RGBA frames into an ffmpeg process."""
+
+    def __init__(self, path, size, fps):
+        width, height = size
+        self.path = path
+        cmd = ['ffmpeg', '-y', '-loglevel', 'error', '-f', 'rawvideo', '-pix_fmt', 'rgba',
+               '-s', f'{width}x{height}', '-r', str(fps), '-i', '-']
+        if path.endswith('.mp4'):
+            cmd += ['-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-vcodec', 'libx264', '-pix_fmt', 'yuv420p']
+        self.proc = subprocess.Popen(cmd + [path], stdin=subprocess.PIPE)
+
+    def write(self, frame):
+        self.proc.stdin.write(frame.tobytes())
+
+    def close(self):
+        self.proc.stdin.close()
+        if self.proc.wait():
+            raise RuntimeError(f"ffmpeg exited with status {self.proc.returncode}")
+
+
+class PNGSequenceWriter:
+    """Write each frame as frame_00000.png, ... into a directory."""
+
+    def __init__(self, path, size, fps):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.count = 0
+
+    def write(self, frame):
+        Image.fromarray(frame).save(os.path.join(self.path, f'frame_{self.count:05d}.png'))
+        self.count += 1
+
+    def close(self):
+        pass
+
+
+class GIFWriter:
+    """Palettise frames as they arrive and save the GIF on close.
+
+    Every frame is held until `close`, so memory grows by width * height
+    bytes per frame; `open_writer` refuses animations over GIF_MAX_BYTES.
+    """
+
+    def __init__(self, path, size, fps):
+        self.path = path
+        self.duration = 1000 / fps
+        self.frames = []
+
+    def write(self, frame):
+        self.frames.append(Image.fromarray(frame).convert('RGB').quantize(colors=256))
+
+    def close(self):
+        first, *rest = self.frames
+        first.save(self.path, save_all=True, append_images=rest, duration=self.duration, loop=0)
+
+
+def open_writer(path, size, fps, n_frames=None):
+    """The best available writer for `path`: ffmpeg, else GIF or PNG sequence.
+
+    The writer's `path` is where the output actually goes. For the GIF
+    fallback, `n_frames` is checked against GIF_MAX_BYTES up front.
+    """
+    if shutil.which('ffmpeg') and os.path.splitext(path)[1]:
+        return FFmpegWriter(path, size, fps)
+    if path.endswith('.gif'):
+        if n_frames is not None and n_frames * size[0] * size[1] > GIF_MAX_BYTES:
+            raise ValueError(f"{n_frames} frames of {size[0]}x{size[1]} exceed the GIF fallback's "
+                             f"{GIF_MAX_BYTES // 2**20} MB limit; install ffmpeg, or lower --frames or --dpi")
+        return GIFWriter(path, size, fps)
+    return PNGSequenceWriter(os.path.splitext(path)[0], size, fps)
+
+
+def render_animation(scene, n_frames, path, fps=30, dpi=100, blit=True):
+    """Render `n_frames` of a scene to `path`, reporting per-frame timing.
+
+    `scene` is a (fig, artists, update) triple as returned by the scene
+    builders below. With `blit`, the animated artists are excluded from the
+    background, which is drawn once; each frame restores it and redraws
+    only those artists. Returns a dict of timing statistics in seconds,
+    plus the `path` actually written (see `open_writer`).
+    """
+    fig, artists, update = scene
+    fig.set_dpi(dpi)
+    canvas = fig.canvas
+    for artist in artists:
+        artist.set_animated(blit)
+    canvas.draw()
+    background = canvas.copy_from_bbox(fig.bbox) if blit else None
+    size = canvas.get_width_height()
+
+    try:
+        writer = open_writer(path, size, fps, n_frames)
+    except Exception:
+        plt.close(fig)
+        raise
+    times = np.empty(n_frames)
+    try:
+        for i in range(n_frames):
+            start = time.perf_counter()
+            update(i)
+            if blit:
+                canvas.restore_region(background)
+                for artist in artists:
+                    artist.axes.draw_artist(artist)
+            else:
+                canvas.draw()
+            writer.write(np.asarray(canvas.buffer_rgba()))
+            times[i] = time.perf_counter() - start
+    finally:
+        writer.close()
+        plt.close(fig)
+
+    return {'path': writer.path, 'frames': n_frames, 'total': float(times.sum()),
+            'mean': float(times.mean()), 'p95': float(np.percentile(times, 95)), 'max': float(times.max()),
+            'fps': n_frames / float(times.sum())}
+
+
+def gravitational_wave_scene(n_frames, n=200, n_particles=12, amplitude=0.3):
+    """Plus-polarised wave: travelling strain field and a deforming particle ring.
+
+    One wave period spans `n_frames` frames, so the animation loops.
+    """
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
+    x = np.linspace(-5, 5, n)
+    X, Y = np.meshgrid(x, x)
+
+    def strain(t):
+        return amplitude * np.sin(2 * np.pi * (t - X / 5))
+
+    image = ax1.imshow(strain(0), extent=(-5, 5, -5, 5), origin='lower', cmap='coolwarm',
+                       vmin=-amplitude, vmax=amplitude)
+    fig.colorbar(image, ax=ax1, label='Strain $h_+$')
+    ax1.set_xlabel('Propagation direction')
+    ax1.set_ylabel('Transverse direction')
+    ax1.set_title('Wave Propagation', fontweight='bold')
+
+    theta = np.linspace(0, 2*np.pi, n_particles + 1)
+    x0, y0 = np.cos(theta), np.sin(theta)
+    ax2.plot(x0, y0, 'k:', lw=1, alpha=0.5)
+    ring, = ax2.plot(x0, y0, 'o-', lw=2, ms=6)
+    label = ax2.text(0.03, 0.95, '', transform=ax2.transAxes, fontsize=11)
+    ax2.plot(0, 0, 'r*', ms=15)
+    ax2.set_xlim(-1.5, 1.5)
+    ax2.set_ylim(-1.5, 1.5)
+    ax2.set_aspect('equal')
+    ax2.grid(alpha=0.3)
+    ax2.set_title('Plus Polarization $h_+$', fontweight='bold')
+    fig.tight_layout()
+
+    def update(i):
+        t = i / n_frames
+        image.set_data(strain(t))
+        h_plus = amplitude * np.sin(2 * np.pi * t)
+        ring.set_data(x0 * (1 + h_plus / 2), y0 * (1 - h_plus / 2))
+        label.set_text(f't = {t:.2f} T')
+
+    return fig, [image, ring, label], update
+
+
+def orbit_scene(n_frames, a=4.0, e=0.6, M=0.02, turns=10, trail=400):
+    """A precessing Schwarzschild orbit, integrated once and revealed frame by frame."""
+    phi = np.linspace(0, 2*np.pi * turns, n_frames)
+    sol = geodesics.integrate(*geodesics.bound_orbit(a, e, M), M,
+                              phi_end=phi[-1], phi_eval=phi)
+    x, y = geodesics.to_cartesian(phi, sol.u[:, 0])
+
+    fig, ax = plt.subplots(figsize=(7, 7))
+    ax.add_patch(plt.Circle((0, 0), 0.3, color='gold', ec='orange', lw=2))
+    path, = ax.plot([], [], 'r-', lw=2, alpha=0.7)
+    body, = ax.plot([], [], 'o', color='darkred', ms=8)
+    shift = np.degrees(geodesics.periapsis_precession(a, e, M))
+    ax.set_xlim(-8, 8)
+    ax.set_ylim(-8, 8)
+    ax.set_aspect('equal')
+    ax.grid(alpha=0.3)
+    ax.set_title(f'Orbital Precession ({shift:.1f}°/orbit)', fontweight='bold')
+    fig.tight_layout()
+
+    def update(i):
+        start = max(0, i - trail)
+        path.set_data(x[start:i + 1], y[start:i + 1])
+        body.set_data(x[i:i + 1], y[i:i + 1])
+
+    return fig, [path, body], update
+
+
+SCENES = {
+    'waves': gravitational_wave_scene,
+    'orbit': orbit_scene,
+}
+
+
+def main(argv=None):
+    """Command line: render one animation."""
+    parser = argparse.ArgumentParser(description="Render a General Relativity animation.")
+    parser.add_argument('scene', choices=sorted(SCENES))
+    parser.add_argument('output', help="output file (.mp4/.gif/...) or PNG-sequence directory")
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--fps', type=int, default=30)
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--no-blit', dest='blit', action='store_false',
+                        help="redraw the whole figure every frame")
+    args = parser.parse_args(argv)
+
+    matplotlib.use('Agg')
+    scene = SCENES[args.scene](args.frames)
+    try:
+        stats = render_animation(scene, args.frames, args.output, args.fps, args.dpi, args.blit)
+    except ValueError as exc:
+        parser.error(str(exc))
+    if stats['path'] != args.output:
+        print(f"⚠ ffmpeg not found: wrote a PNG sequence instead of {args.output}")
+    print(f"✓ Saved: {stats['path']} ({stats['frames']} frames, {stats['total']:.1f}s)")
+    print(f"  per frame: mean {stats['mean'] * 1e3:.1f} ms, p95 {stats['p95'] * 1e3:.1f} ms, "
+          f"max {stats['max'] * 1e3:.1f} ms ({stats['fps']:.0f} frames/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+"""
+Benchmarks - Kernels and Figures with Regression Tracking
+=========================================================
+Timings for the numerical kernels in isolation and for every figure at
+several resolutions, saved to a JSON baseline and compared against it.
+
+Each benchmark is run `repeat` times and scored by its fastest run (the
+least noisy estimate on a busy machine). Figure benchmarks render to
+in-memory PNGs with the Agg backend and also record the per-phase
+split from `profiling`, so a regression can be traced to data, artists,
+layout or savefig.
+
+    python benchmarks.py --save                 # record a baseline
+    python benchmarks.py --compare              # fail if >25% slower than it
+    python benchmarks.py --compare --threshold 0.1 -k kernel/
+    python benchmarks.py --full                 # include the largest sizes
+    python benchmarks.py --check-startup        # fail if importing the CLI got heavy
+    python benchmarks.py --surface              # rubber-sheet render time vs mesh size
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+import matplotlib
+
+matplotlib.use('Agg')
+
+import geodesics
+import invariants
+import lensing
+import metrics
+import profiling
+import tensors
+import validation
+import visualizations
+import waveforms
+
+BASELINE_PATH = '.benchmarks/baseline.json'
+THRESHOLD = 0.25
+
+# `import visualizations` must not pull these in, and must stay under budget
+HEAVY_MODULES = ('numpy', 'matplotlib', 'datacache', 'figuredata', 'geodesics', 'invariants',
+                 'lensing', 'metrics', 'sampling', 'tensors', 'validation', 'waveforms')
+STARTUP_BUDGET_MS = 150
+_PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+# Numerical kernels: name -> (setup, run); setup builds the inputs once,
+# run(inputs) is what is timed.
+
+def _geodesic_batch():
+    a = np.linspace(6.0, 40.0, 2000)
+    return geodesics.bound_orbit(a, 0.5, 1.0)
+
+
+def _lensing_inputs():
+    d_l, d_s = 1000.0, 2000.0
+    theta_e = lensing.einstein_radius(1.0, d_l, d_s)
+    source = lensing.checkerboard_source(theta_e / 2, spot_radius=theta_e / 8)
+    return source, 6 * theta_e, d_l, d_s, lensing.deflection_table()
+
+
+def _kerr_grid():
+    x = np.linspace(-5, 5, 1000)
+    return np.meshgrid(x, x)
+
+
+def _bl_grid():
+    r = np.linspace(2.0, 10.0, 200)
+    theta = np.linspace(0.1, np.pi - 0.1, 200)
+    return np.meshgrid(r, theta, indexing='ij')
+
+
+KERNELS = {
+    'geodesics.integrate[2000 orbits]': (
+        _geodesic_batch,
+        lambda orbit: geodesics.integrate(*orbit, 1.0, phi_end=4*np.pi)),
+    'geodesics.periapsis_precession[9]': (
+        lambda: np.geomspace(20, 1e5, 9),
+        lambda a: geodesics.periapsis_precession(a, 0.3, 1.0)),
+    'lensing.deflection_exact[4096]': (
+        lambda: lensing.B_CRIT + np.geomspace(1e-5, 1e4, 4096),
+        lensing.deflection_exact),
+    'lensing.render_lensed[1024x1024]': (
+        _lensing_inputs,
+        lambda p: lensing.render_lensed(p[0], (1024, 1024), p[1], 1.0, p[2], p[3], table=p[4])),
+    'invariants.kerr_kretschmann[1000x1000]': (
+        _kerr_grid,
+        lambda g: invariants.kerr_kretschmann(g[0], 0.0, g[1], 1.0, 0.9)),
+    'tensors.Curvature(kerr).kretschmann[200x200]': (
+        _bl_grid,
+        lambda g: tensors.Curvature(tensors.kerr_metric, 0.0, g[0], g[1], 0.0, a=0.9).kretschmann),
+    'metrics.Kerr.inverse_metric[64x256x128]': (
+        lambda: (metrics.Kerr(1.0, np.linspace(0.0, 0.99, 64)[:, None, None]),
+                 np.linspace(2.5, 50.0, 256)[None, :, None],
+                 np.linspace(0.05, np.pi - 0.05, 128)[None, None, :]),
+        lambda p: p[0].inverse_metric(p[1], p[2])),
+    'validation.run_checks[README]': (lambda: None, lambda _: validation.run_checks()),
+    'waveforms.taylorf2[1000 templates]': (
+        lambda: (np.arange(20.0, 1024.0, 0.5), *waveforms.random_bank(1000)),
+        lambda p: waveforms.taylorf2(*p)),
+}
+
+
+# Figures: (registry key, [parameter overrides per resolution]); the
+# first entries run by default, entries marked full=True only with --full.
+
+def _sizes(key, values, full=()):
+    return [({key: v}, False) for v in values] + [({key: v}, True) for v in full]
+
+
+# The rubber-sheet surface in its three modes, against mesh size: thinned
+# to SURFACE_FACES (the default), every face drawn, and the raster backend.
+_SURFACE_SIZES = [(80, False), (250, False), (500, False), (1000, True), (2000, True)]
+
+FIGURE_CASES = [
+    ('spacetime_curvature', _sizes('n', [80, 250, 500], full=[1000, 2000])),
+    ('spacetime_curvature', [({'n': n, 'max_faces': n * n}, is_full or n > 250)
+                             for n, is_full in _SURFACE_SIZES[:4]]),
+    ('spacetime_curvature', [({'n': n, 'surface': 'raster'}, is_full) for n, is_full in _SURFACE_SIZES]),
+    ('light_bending', _sizes('image_size', [400, 800], full=[1600])),
+    ('metric_tensor', _sizes('n', [150, 1500], full=[15000])),
+    ('curvature_tensors', _sizes('dpi', [100, 200], full=[300])),
+    ('tensor_indices', _sizes('dpi', [100, 200], full=[300])),
+    ('gravitational_waves', _sizes('n', [200, 400], full=[800])),
+    ('geodesics', _sizes('n_orbit', [200, 2000], full=[20000])),
+]
+
+
+def _python(*args):
+    """Run a fresh interpreter in the project directory; returns its stdout."""
+    return subprocess.run([sys.executable, *args], cwd=_PROJECT_DIR, check=True,
+                          capture_output=True, text=True).stdout
+
+
+STARTUP = {
+    'startup/import visualizations': ('-c', 'import visualizations'),
+    'startup/visualizations.py --list': ('visualizations.py', '--list'),
+    'startup/visualizations.py --help': ('visualizations.py', '--help'),
+}
+
+
+def startup_check(budget_ms=STARTUP_BUDGET_MS, repeat=5):
+    """Import `visualizations` in fresh interpreters.
+
+    Returns (fastest import time in ms, heavy modules it loaded, ok), with
+    ok False if any heavy module was loaded or the budget was exceeded.
+    """
+    script = ("import json, sys, time\n"
+              "start = time.perf_counter()\n"
+              "import visualizations\n"
+              "elapsed = time.perf_counter() - start\n"
+              f"print(json.dumps([elapsed * 1e3, [m for m in {HEAVY_MODULES!r} if m in sys.modules]]))\n")
+    runs = [json.loads(_python('-c', script)) for _ in range(repeat)]
+    ms = min(run[0] for run in runs)
+    heavy = sorted(set().union(*(run[1] for run in runs)))
+    return ms, heavy, not heavy and ms <= budget_ms
+
+
+def _label(params):
+    return ','.join(f'{k}={v}' for k, v in params.items())
+
+
+def collect(full=False):
+    """All benchmarks as {name: (setup, run)}: startup, kernels, then figures."""
+    cases = {name: (lambda: None, lambda _, a=args: _python(*a)) for name, args in STARTUP.items()}
+    cases.update({f'kernel/{name}': spec for name, spec in KERNELS.items()})
+    figures = {figure.key: figure for figure in visualizations.FIGURES}
+    for key, sizes in FIGURE_CASES:
+        for params, is_full in sizes:
+            if full or not is_full:
+                cases[f'figure/{key}[{_label(params)}]'] = (lambda: None, _render(figures[key], params))
+    return cases
+
+
+def _render(figure, params):
+    def run(_):
+        with profiling.record() as recorder:
+            visualizations.render_figure(figure, params)
+        return recorder.report()
+    return run
+
+
+def time_case(setup, run, repeat=3):
+    """Fastest of `repeat` runs (seconds) and the result of that run."""
+    inputs = setup()
+    best, best_result = np.inf, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run(inputs)
+        elapsed = time.perf_counter() - start
+        if elapsed < best:
+            best, best_result = elapsed, result
+    return best, best_result
+
+
+def run_benchmarks(pattern='*', full=False, repeat=3):
+    """Run the benchmarks whose name matches the glob `pattern`.
+
+    Figures are rendered to in-memory PNGs. Returns
+    {name: {'seconds': ..., 'phases': {...}}} (phases for figures only).
+    """
+    results = {}
+    for name, (setup, run) in collect(full).items():
+        if not fnmatch.fnmatch(name, pattern) and pattern not in name:
+            continue
+        seconds, result = time_case(setup, run, repeat)
+        entry = {'seconds': seconds}
+        if name.startswith('figure/'):
+            entry['phases'] = {p: v['wall'] for p, v in result['phases'].items()}
+        results[name] = entry
+        print(f"  {name:<58} {seconds * 1e3:10.1f} ms")
+    return results
+
+
+def environment():
+    """Machine and library versions the timings were taken on."""
+    return {'python': platform.python_version(), 'platform': platform.platform(),
+            'machine': platform.machine(), 'cpus': os.cpu_count(),
+            'numpy': np.__version__, 'matplotlib': matplotlib.__version__}
+
+
+def save_baseline(path, results):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({'version': 1, 'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                   'environment': environment(), 'results': results}, f, indent=2)
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """Rows (name, baseline s, current s, ratio, regressed) for shared benchmarks.
+
+    A benchmark regresses when it is more than `threshold` (a fraction)
+    slower than its baseline.
+    """
+    rows = []
+    for name, entry in results.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]['seconds'], entry['seconds']
+        ratio = after / before
+        rows.append((name, before, after, ratio, ratio > 1 + threshold))
+    return rows
+
+
+def surface_table(sizes=(80, 250, 500, 1000, 2000), repeat=3, dpi=200):
+    """Render time of the rubber-sheet panel alone against mesh size.
+
+    Rows of (n, mode, elements drawn, seconds) for an n x n mesh drawn
+    thinned to SURFACE_FACES, with every face (only up to 1000 -- it
+    grows with n^2), and by the raster backend; the time covers drawing
+    and saving a one-panel PNG at `dpi`.
+    """
+    import io
+
+    import matplotlib.pyplot as plt
+
+    import figuredata
+
+    modes = [('mesh, thinned', 'mesh', visualizations.SURFACE_FACES),
+             ('mesh, every face', 'mesh', None),
+             ('raster', 'raster', None)]
+    rows = []
+    for n in sizes:
+        for label, surface, max_faces in modes:
+            if max_faces is None and surface == 'mesh' and n > 1000:
+                continue
+            data = figuredata.spacetime_curvature(n=n, surface=surface)
+            faces = max_faces or n * n
+            if surface == 'raster':
+                elements = min(n, figuredata.SURFACE_RASTER_MAX) ** 2
+            else:
+                elements = int(np.prod([len(i) - 1 for i in visualizations.surface_lod((n, n), faces)]))
+
+            def run(_):
+                fig = plt.figure(figsize=(20 / 3, 6))
+                visualizations.draw_well(fig, 111, data, faces)
+                fig.savefig(io.BytesIO(), format='png', dpi=dpi)
+                plt.close(fig)
+
+            seconds, _ = time_case(lambda: None, run, repeat)
+            rows.append((n, label, elements, seconds))
+    return rows
+
+
+def main(argv=None):
+    """Command line: run, save and compare benchmarks."""
+    parser = argparse.ArgumentParser(description="Benchmark kernels and figures.")
+    parser.add_argument('-k', '--filter', default='*',
+                        help="glob or substring selecting benchmarks, e.g. 'kernel/*' or spacetime")
+    parser.add_argument('--full', action='store_true', help="include the largest resolutions")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per benchmark (fastest counts)")
+    parser.add_argument('--list', action='store_true', help="list benchmark names and exit")
+    parser.add_argument('--save', nargs='?', const=BASELINE_PATH, metavar='PATH',
+                        help=f"write the results as a baseline (default: {BASELINE_PATH})")
+    parser.add_argument('--compare', nargs='?', const=BASELINE_PATH, metavar='PATH',
+                        help=f"compare against a baseline (default: {BASELINE_PATH})")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help=f"allowed slowdown as a fraction (default: {THRESHOLD})")
+    parser.add_argument('--check-startup', action='store_true',
+                        help=f"only check that importing visualizations loads no heavy modules "
+                             f"and takes under {STARTUP_BUDGET_MS} ms")
+    parser.add_argument('--surface', action='store_true',
+                        help="only print the rubber-sheet render time against mesh size")
+    args = parser.parse_args(argv)
+
+    if args.surface:
+        print(f"{'mesh':>11} {'mode':<17} {'faces/pixels':>12} {'ms':>8}")
+        for n, label, elements, seconds in surface_table(repeat=args.repeat):
+            print(f"{f'{n} x {n}':>11} {label:<17} {elements:12d} {seconds * 1e3:8.1f}")
+        return 0
+
+    if args.check_startup:
+        ms, heavy, ok = startup_check()
+        print(f"import visualizations: {ms:.1f} ms (budget {STARTUP_BUDGET_MS} ms)")
+        if heavy:
+            print(f"✗ heavy modules imported at startup: {', '.join(heavy)}")
+        print("✓ Startup OK" if ok else "✗ Startup check failed")
+        return 0 if ok else 1
+
+    if args.list:
+        for name in collect(args.full):
+            print(name)
+        return 0
+
+    baseline = load_baseline(args.compare)['results'] if args.compare else None
+    results = run_benchmarks(args.filter, args.full, args.repeat)
+    if args.save:
+        save_baseline(args.save, results)
+        print(f"\n✓ Saved baseline: {args.save} ({len(results)} benchmarks)")
+    if baseline is None:
+        return 0
+
+    rows = compare(results, baseline, args.threshold)
+    print(f"\n{'benchmark':<58} {'baseline':>10} {'current':>10} {'ratio':>6}")
+    for name, before, after, ratio, regressed in rows:
+        flag = '  ✗ REGRESSION' if regressed else ''
+        print(f"{name:<58} {before * 1e3:8.1f}ms {after * 1e3:8.1f}ms {ratio:6.2f}{flag}")
+    regressions = sum(1 for row in rows if row[-1])
+    missing = len(results) - len(rows)
+    if missing:
+        print(f"\n{missing} benchmark(s) not in the baseline")
+    if regressions:
+        print(f"\n✗ {regressions} benchmark(s) slower than baseline by more than {args.threshold:.0%}")
+        return 1
+    print(f"\n✓ No regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,123 @@
+"""
+Figure Data Cache - On-Disk Memoization of Producer Outputs
+===========================================================
+Keeps the arrays behind a figure so re-styling it does not recompute them.
+
+Every figure is split into a pure data producer (parameters in, a dict
+of NumPy arrays out) and a renderer. `DataCache` stores producer outputs
+as one .npz file per key in a directory shared by all worker processes,
+and bounds the directory's total size: a hit refreshes the file's
+modification time, and after every write the least recently used files
+are deleted until the total fits in `max_bytes`. Writes go to a
+temporary file that is renamed into place, so concurrent workers never
+see a partial entry; an entry deleted by another process's eviction is
+simply a miss, and one that cannot be read (truncated by a crash or a
+full disk, say) is deleted and counted as a miss.
+
+The key is chosen by the caller (see `visualizations.figure_data`, which
+hashes the producer's source, its parameters and the numpy version).
+"""
+
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+
+
+def save_atomic(path, arrays):
+    """Write {name: array} to the .npz at `path` through a temporary file in
+    the same directory, so readers see the old file or the new one, never
+    a partial one."""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class DataCache:
+    """Size-bounded, least-recently-used store of {name: array} dicts on disk."""
+
+    def __init__(self, directory, max_bytes=256 * 2**20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = self.misses = self.evictions = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def get(self, key):
+        """The arrays stored under `key`, or None (deleting the entry if it is corrupt)."""
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as f:
+                arrays = {name: f[name] for name in f.files}
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        except (ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self.misses += 1
+            return None
+        self.hits += 1
+        return arrays
+
+    def put(self, key, arrays):
+        """Store `arrays` under `key`, then evict down to `max_bytes`."""
+        save_atomic(self._path(key), arrays)
+        self.evict()
+
+    def entries(self):
+        """(mtime, size, path) of every entry, oldest first."""
+        rows = []
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return rows
+        for name in names:
+            if not name.endswith('.npz'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            rows.append((st.st_mtime, st.st_size, path))
+        return sorted(rows)
+
+    def evict(self):
+        """Delete least recently used entries until the total size is within `max_bytes`."""
+        rows = self.entries()
+        total = sum(size for _, size, _ in rows)
+        for _, size, path in rows:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                self.evictions += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def stats(self):
+        rows = self.entries()
+        return {'entries': len(rows), 'bytes': sum(size for _, size, _ in rows),
+                'max_bytes': self.max_bytes, 'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions}
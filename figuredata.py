@@ -0,0 +1,169 @@
+"""
+Figure Data - Pure Producers Behind the Visualizations
+======================================================
+The numerical half of every figure: parameters in, NumPy arrays out.
+
+Each function here takes the figure's keyword parameters and returns a
+flat dict of arrays and scalars, with no matplotlib in sight, so the
+result can be cached on disk (`datacache`), reused by other tools, or
+re-rendered with a different style without recomputing it. The renderers
+live in `visualizations` as draw_<key>(data).
+
+Surfaces, images and contour fields are returned as float32, which
+halves their memory and cache footprint without a visible difference at
+plotting precision; 1D profiles and orbits stay float64.
+"""
+
+import numpy as np
+
+import geodesics
+import invariants
+import lensing
+import metrics
+import sampling
+import waveforms
+
+FIELD_DTYPE = np.float32
+
+# Largest side of the rubber-sheet raster: an image finer than the figure's
+# pixels costs memory and shading time without showing anything more.
+SURFACE_RASTER_MAX = 1024
+
+
+def spacetime_curvature(n=80, n_radial=150, r_s=2.0, n_slice=300, spin=0.9, surface='mesh'):
+    """Rubber-sheet well, its cross-section and a Kerr Kretschmann slice.
+
+    With surface='mesh' the well is an n x n polar mesh (X, Y, Z) for
+    plot_surface; with surface='raster' it is sampled on a uniform Cartesian
+    grid (x, Z) for an image, n x n but at most SURFACE_RASTER_MAX a side.
+    """
+    well = lambda r: -1.0 / np.maximum(r, 0.5)
+    if surface == 'raster':
+        x = np.linspace(-10, 10, min(n, SURFACE_RASTER_MAX))
+        Z = well(np.hypot(x[None, :], x[:, None]))
+        field = {'x': x, 'Z': Z.astype(FIELD_DTYPE)}
+    else:
+        # A polar mesh whose rings crowd into the well, floored at r = 0.5
+        X, Y, Z = sampling.polar_surface(well, (0, 10), n, n, include=[0.5])
+        field = {'X': X.astype(FIELD_DTYPE), 'Y': Y.astype(FIELD_DTYPE), 'Z': Z.astype(FIELD_DTYPE)}
+    r, z = sampling.adaptive_1d(lambda r: -1.0 / r, 0.5, 10, n_radial)
+
+    # Kretschmann scalar K = R_abcd R^abcd (in units of M^-4) in the meridional plane
+    M = r_s / 2
+    xs = np.linspace(-5, 5, n_slice)
+    XS, ZS = np.meshgrid(xs, xs)
+    K = invariants.kerr_kretschmann(XS, 0.0, ZS, M, spin * M) * M**4
+    kerr = metrics.Kerr(M, spin * M)
+    r_plus, _ = kerr.horizons()
+    theta = np.linspace(0, 2 * np.pi, 200)
+    r_ergo = kerr.ergosphere(theta)
+    return {**field, 'surface': surface, 'r': r, 'z': z, 'r_s': r_s, 'spin': spin, 'M': M,
+            'xs': xs, 'K': K.astype(FIELD_DTYPE), 'r_plus': r_plus,
+            # r = const is an oblate spheroid in Kerr-Schild Cartesian coordinates
+            'ergo_x': np.hypot(r_ergo, spin * M) * np.sin(theta), 'ergo_z': r_ergo * np.cos(theta)}
+
+
+def light_bending(n_rays=8, n_samples=150, M=0.25, image_size=400):
+    """Null geodesics past a mass and a ray-traced lensed checkerboard."""
+    # Rays entering from x = -10 at heights y (mirrored for y > 0)
+    heights = np.linspace(-7, 7, n_rays)
+    heights = heights[np.abs(heights) >= 0.6]
+    b = np.abs(heights)
+    r0 = np.hypot(10, b)
+    phi = np.linspace(0, 2*np.pi, 20 * n_samples)
+    sol = geodesics.integrate(*geodesics.null_ray(b, r0, M), M, phi_end=2*np.pi,
+                              phi_eval=phi, r_max=np.hypot(10, 8))
+    x_ray, y_ray = geodesics.to_cartesian(phi[:, None] + np.pi + np.arcsin(b / r0), sol.u)
+    y_ray = np.where(heights > 0, -y_ray, y_ray)
+
+    # Lens halfway to the source, field of view 6 Einstein radii
+    d_l, d_s = 1000.0, 2000.0
+    theta_e = lensing.einstein_radius(1.0, d_l, d_s)
+    source = lensing.checkerboard_source(theta_e / 2, spot_radius=theta_e / 8)
+    image = lensing.render_lensed(source, (image_size, image_size), 6 * theta_e, 1.0, d_l, d_s)
+    return {'heights': heights, 'x_ray': x_ray, 'y_ray': y_ray,
+            'captured': sol.status == geodesics.CAPTURED, 'image': image.astype(FIELD_DTYPE)}
+
+
+def metric_tensor(n=150, r_s=2.0, spin=0.9):
+    """Schwarzschild g_tt and clock rate, Kerr g_tphi and ZAMO lapse, sampled adaptively.
+
+    Each curve is densest where it bends or ends at a horizon; static
+    clocks do not exist inside r_s, so the clock rate is NaN there. The
+    horizons are sampled exactly, so only components that are finite
+    there are evaluated (g_rr diverges).
+    """
+    M = r_s / 2
+    schwarzschild = metrics.Schwarzschild(M)
+    r, g_tt = sampling.adaptive_1d(lambda r: schwarzschild.g_tt(r, np.pi / 2),
+                                   0.1, 10, n, clip=(-2, 0.5), include=[r_s])
+    r_d, dilation = sampling.adaptive_1d(lambda r: schwarzschild.time_dilation(r, np.pi / 2),
+                                         0.1, 10, n, include=[r_s])
+    # a spinning hole of the same mass, in its equatorial plane
+    kerr = metrics.Kerr(M, spin * M)
+    r_plus, _ = kerr.horizons()
+    r_k, g_tphi = sampling.adaptive_1d(lambda r: kerr.g_tphi(r, np.pi / 2),
+                                       0.1, 10, n, clip=(-2, 0.5), include=[r_plus])
+    r_z, lapse = sampling.adaptive_1d(lambda r: kerr.time_dilation(r, np.pi / 2, observer='zamo'),
+                                      0.1, 10, n, include=[r_plus])
+    return {'r': r, 'g_tt': g_tt, 'r_d': r_d, 'dilation': dilation, 'r_k': r_k, 'g_tphi': g_tphi,
+            'r_z': r_z, 'lapse': lapse, 'r_s': r_s, 'r_plus': r_plus, 'spin': spin}
+
+
+def tensor_indices(vector=(3.0, 2.5), e1=(2.0, 0.2), e2=(0.7, 1.8)):
+    """Contravariant and covariant components of `vector` in the non-orthogonal basis (e1, e2)."""
+    v, e1, e2 = (np.asarray(u, dtype=float) for u in (vector, e1, e2))
+    # v = v^1 e1 + v^2 e2
+    contravariant = np.linalg.solve(np.column_stack([e1, e2]), v)
+    # v_i = v . e_i, with feet of the perpendiculars from v onto each basis line
+    covariant = np.array([v @ e1, v @ e2])
+    return {'vector': v, 'e1': e1, 'e2': e2, 'contravariant': contravariant,
+            'covariant': covariant,
+            'proj_e1': covariant[0] / (e1 @ e1) * e1, 'proj_e2': covariant[1] / (e2 @ e2) * e2}
+
+
+def gravitational_waves(n=200, n_particles=12, m1=30.0, m2=30.0):
+    """The 3.5PN TaylorF2 chirp h+(t - x) over its last 0.3 s, and a ring of test particles."""
+    t_c = 3.9
+    t_chirp, h_chirp = waveforms.chirp_time_series(m1, m2, duration=4.0, t_c=t_c)
+    x, t = np.linspace(-50, 50, n), np.linspace(-0.3, 0, n)
+    X, T = np.meshgrid(x, t)
+    Z = np.interp(t_c + T - X / 1000, t_chirp, h_chirp)
+    Z /= np.abs(Z).max()
+
+    # Plus polarization stretching a unit ring at t = 0 and half a period
+    theta = np.linspace(0, 2*np.pi, n_particles, endpoint=False)
+    times = np.array([0, 0.5])
+    h_plus = 0.3 * np.cos(times * np.pi)[:, None]
+    return {'x': x, 't': t, 'Z': Z.astype(FIELD_DTYPE), 'm1': m1, 'm2': m2, 'times': times,
+            'ring_x': np.cos(theta) * (1 + h_plus), 'ring_y': np.sin(theta) * (1 - h_plus)}
+
+
+def geodesic_orbits(n_orbit=200, n_precession=300, M=0.02):
+    """Circular, elliptical and hyperbolic orbits, and a precessing orbit against Newton's ellipse."""
+    # Circular, elliptical and hyperbolic timelike geodesics in one batch
+    orbits = [
+        geodesics.circular_orbit(3.0, M),
+        geodesics.bound_orbit(4.0, 0.6, M),
+        geodesics.scatter_orbit(2.0, 0.1, 20.0, M),
+    ]
+    u0, w0, alpha = (np.array(v) for v in zip(*orbits))
+    phi = np.linspace(0, 2*np.pi, n_orbit)
+    sol = geodesics.integrate(u0, w0, alpha, M, phi_end=2*np.pi, phi_eval=phi, r_max=20.0)
+    x, y = geodesics.to_cartesian(phi, sol.u)
+
+    # Rotate the flyby so its periapsis lies on the +x axis
+    phi_p = phi[np.nanargmax(sol.u[:, 2])]
+    x[:, 2], y[:, 2] = (x[:, 2] * np.cos(phi_p) + y[:, 2] * np.sin(phi_p),
+                        -x[:, 2] * np.sin(phi_p) + y[:, 2] * np.cos(phi_p))
+
+    theta_n = np.linspace(0, 4*np.pi, n_precession)
+    a_n, e_n = 4, 0.6
+    r_n = a_n * (1 - e_n**2) / (1 + e_n * np.cos(theta_n))
+    orbit = geodesics.integrate(*geodesics.bound_orbit(a_n, e_n, M), M,
+                                phi_end=4*np.pi, phi_eval=theta_n)
+    x_e, y_e = geodesics.to_cartesian(theta_n, orbit.u[:, 0])
+    return {'x': x, 'y': y, 'x_newton': r_n * np.cos(theta_n), 'y_newton': r_n * np.sin(theta_n),
+            'x_einstein': x_e, 'y_einstein': y_e,
+            'shift_deg': np.degrees(geodesics.periapsis_precession(a_n, e_n, M))}
+
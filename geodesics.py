@@ -0,0 +1,317 @@
+"""
+Schwarzschild Geodesics - Vectorized Integrator
+===============================================
+Batch integration of timelike and null geodesics in the Schwarzschild metric.
+
+Geodesics are confined to the equatorial plane and written in Binet form,
+with u = 1/r and w = du/dphi, in geometric units (G = c = 1):
+
+    u'' = -u + M * alpha + 3 M u^2,     alpha = kappa / L^2
+
+where kappa = 1 for massive particles and 0 for light. The first integral
+
+    C = w^2 + (1 - 2 M u) (alpha + u^2)  ( = E^2 / L^2, or 1 / b^2 for light)
+
+is conserved and used to check the integration. Every particle is advanced
+by its own adaptive Dormand-Prince 5(4) step, but all particles are stepped
+together as NumPy arrays, so thousands of orbits or rays cost little more
+than one. Radial (L = 0) geodesics are not representable in this form.
+"""
+
+import time
+from collections import namedtuple
+
+import numpy as np
+
+# Particle status codes
+RUNNING, FINISHED, CAPTURED, ESCAPED = 0, 1, 2, 3
+
+GeodesicSolution = namedtuple('GeodesicSolution', 'phi u w status phi_stop u_stop w_stop drift')
+GeodesicSolution.__doc__ = """Result of `integrate`.
+
+phi       -- (n_eval,) output angles (empty if no `phi_eval` was given)
+u, w      -- (n_eval, n) u = 1/r and du/dphi at `phi`, NaN after termination
+status    -- (n,) FINISHED, CAPTURED (crossed the horizon) or ESCAPED
+phi_stop  -- (n,) angle at which each particle stopped
+u_stop, w_stop -- (n,) state at `phi_stop`
+drift     -- (n,) max relative drift of the conserved quantity C
+"""
+
+# Dormand-Prince 5(4) tableau (autonomous system, so no node coefficients)
+_A = [
+    [],
+    [1/5],
+    [3/40, 9/40],
+    [44/45, -56/15, 32/9],
+    [19372/6561, -25360/2187, 64448/6561, -212/729],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+    [35/384, 0, 500/1113, 125/192, -2187/6784, 11/84],
+]
+_B = np.array(_A[6] + [0])
+_E = np.array([71/57600, 0, -71/16695, 71/1920, -17253/339200, 22/525, -1/40])
+
+
+def _rhs(u, w, alpha, M):
+    """Derivatives (du/dphi, dw/dphi) of the Binet system."""
+    return w, -u + M * alpha + 3 * M * u * u
+
+
+def conserved(u, w, alpha, M=1.0):
+    """The first integral C = E^2/L^2 (timelike) or 1/b^2 (null)."""
+    return w * w + (1 - 2 * M * u) * (alpha + u * u)
+
+
+def _dp_step(u, w, alpha, M, h):
+    """One Dormand-Prince step; returns new (u, w) and the error estimate."""
+    ku, kw = [], []
+    for i in range(7):
+        du = sum(a * k for a, k in zip(_A[i], ku)) if i else 0
+        dw = sum(a * k for a, k in zip(_A[i], kw)) if i else 0
+        fu, fw = _rhs(u + h * du, w + h * dw, alpha, M)
+        ku.append(fu)
+        kw.append(fw)
+    # Stage 7 is evaluated at the 5th-order solution (FSAL)
+    u_new = u + h * sum(b * k for b, k in zip(_B, ku))
+    w_new = w + h * sum(b * k for b, k in zip(_B, kw))
+    err_u = h * sum(e * k for e, k in zip(_E, ku))
+    err_w = h * sum(e * k for e, k in zip(_E, kw))
+    return u_new, w_new, err_u, err_w
+
+
+def _hermite(theta, h, y0, dy0, y1, dy1):
+    """Cubic Hermite interpolation across one step, theta in [0, 1]."""
+    t2, t3 = theta * theta, theta * theta * theta
+    return ((2*t3 - 3*t2 + 1) * y0 + (t3 - 2*t2 + theta) * h * dy0
+            + (-2*t3 + 3*t2) * y1 + (t3 - t2) * h * dy1)
+
+
+def _step_to_radius(u, w, alpha, M, h, u_end, target, iterations=4):
+    """Shorten steps that overshot u = `target` so they end on it.
+
+    Newton's method on the step length, starting from linear
+    interpolation; returns the new step lengths and end states.
+    """
+    s = h * np.clip((target - u) / (u_end - u), 0.0, 1.0)
+    for _ in range(iterations):
+        u1, w1, _, _ = _dp_step(u, w, alpha, M, s)
+        s = np.clip(s - (u1 - target) / np.where(w1 != 0, w1, np.inf), 0.0, h)
+    u1, w1, _, _ = _dp_step(u, w, alpha, M, s)
+    return s, u1, w1
+
+
+def integrate(u0, w0, alpha, M=1.0, phi_end=2*np.pi, phi_eval=None,
+              rtol=1e-10, atol=1e-12, r_max=np.inf, h0=1e-2, max_steps=100000):
+    """Integrate a batch of geodesics from phi = 0 to `phi_end`.
+
+    `u0`, `w0`, `alpha` and `phi_end` broadcast to one 1D batch. A particle
+    stops when it crosses the horizon r = 2M (CAPTURED), moves outward past
+    `r_max` (ESCAPED; r_max = inf stops at u = 0), or reaches `phi_end`.
+    `phi_eval` is an increasing grid of output angles shared by the whole
+    batch, filled by Hermite interpolation of the accepted steps.
+    """
+    u0, w0, alpha, phi_end = (a.astype(float).ravel() for a in
+                              np.broadcast_arrays(u0, w0, alpha, phi_end))
+    n = u0.size
+    phi_eval = np.empty(0) if phi_eval is None else np.asarray(phi_eval, dtype=float)
+    u_out = np.full((phi_eval.size, n), np.nan)
+    w_out = np.full((phi_eval.size, n), np.nan)
+
+    u, w = u0.copy(), w0.copy()
+    phi = np.zeros(n)
+    h = np.minimum(np.full(n, h0), phi_end)
+    c0 = conserved(u, w, alpha, M)
+    drift = np.zeros(n)
+    status = np.full(n, RUNNING)
+    status[phi_end <= 0] = FINISHED
+    next_out = np.searchsorted(phi_eval, 0.0)
+    next_out = np.full(n, next_out)
+    u_horizon = 1 / (2 * M)
+    u_escape = 0.0 if np.isinf(r_max) else 1 / r_max
+
+    for _ in range(max_steps):
+        act = np.flatnonzero(status == RUNNING)
+        if act.size == 0:
+            break
+        ua, wa, aa, pa = u[act], w[act], alpha[act], phi[act]
+        ha = np.minimum(h[act], phi_end[act] - pa)
+        u1, w1, eu, ew = _dp_step(ua, wa, aa, M, ha)
+
+        scale_u = atol + rtol * np.maximum(np.abs(ua), np.abs(u1))
+        scale_w = atol + rtol * np.maximum(np.abs(wa), np.abs(w1))
+        err = np.sqrt(0.5 * ((eu / scale_u)**2 + (ew / scale_w)**2))
+        err = np.where(np.isfinite(err), err, np.inf)
+        ok = err <= 1
+        factor = np.clip(0.9 * np.maximum(err, 1e-10) ** -0.2, 0.2, 10.0)
+        h[act] = ha * np.where(ok, factor, np.minimum(factor, 1.0))
+
+        acc = act[ok]
+        if acc.size == 0:
+            continue
+        ua, wa, aa, pa, ha = ua[ok], wa[ok], aa[ok], pa[ok], ha[ok]
+        u1, w1 = u1[ok], w1[ok]
+
+        # Particles crossing the horizon or escaping stop exactly on that radius
+        captured = u1 >= u_horizon
+        escaped = (u1 <= u_escape) & (w1 < 0)
+        stop = np.flatnonzero(captured | escaped)
+        if stop.size:
+            target = np.where(captured[stop], u_horizon, u_escape)
+            hs, u1[stop], w1[stop] = _step_to_radius(ua[stop], wa[stop], aa[stop], M,
+                                                     ha[stop], u1[stop], target)
+            ha[stop] = hs
+
+        # Dense output for every requested angle inside the accepted step
+        if phi_eval.size:
+            _, dw0 = _rhs(ua, wa, aa, M)
+            _, dw1 = _rhs(u1, w1, aa, M)
+            pos = next_out[acc]
+            while True:
+                sel = np.flatnonzero(pos < phi_eval.size)
+                sel = sel[phi_eval[pos[sel]] <= pa[sel] + ha[sel]]
+                if sel.size == 0:
+                    break
+                theta = (phi_eval[pos[sel]] - pa[sel]) / ha[sel]
+                args = (theta, ha[sel])
+                u_out[pos[sel], acc[sel]] = _hermite(*args, ua[sel], wa[sel], u1[sel], w1[sel])
+                w_out[pos[sel], acc[sel]] = _hermite(*args, wa[sel], dw0[sel], w1[sel], dw1[sel])
+                pos[sel] += 1
+            next_out[acc] = pos
+
+        u[acc], w[acc], phi[acc] = u1, w1, pa + ha
+        c0a = c0[acc]
+        drift[acc] = np.maximum(drift[acc], np.abs(conserved(u1, w1, aa, M) - c0a)
+                                / np.maximum(np.abs(c0a), 1e-300))
+        status[acc[captured]] = CAPTURED
+        status[acc[escaped]] = ESCAPED
+        done = acc[phi[acc] >= phi_end[acc]]
+        status[done[status[done] == RUNNING]] = FINISHED
+
+    return GeodesicSolution(phi_eval, u_out, w_out, status, phi, u, w, drift)
+
+
+def to_cartesian(phi, u):
+    """Equatorial-plane (x, y) for angles `phi` and u = 1/r (NaN where u <= 0)."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = np.where(u > 0, 1 / u, np.nan)
+    phi = np.asarray(phi)
+    if phi.ndim < np.ndim(r):
+        phi = phi.reshape(phi.shape + (1,) * (np.ndim(r) - phi.ndim))
+    return r * np.cos(phi), r * np.sin(phi)
+
+
+def bound_orbit(a, e, M=1.0):
+    """Initial (u0, w0, alpha) at periapsis of the orbit with semi-major axis `a`
+    and eccentricity `e`, defined by the turning points r = a(1 -+ e)."""
+    a, e = np.asarray(a, dtype=float), np.asarray(e, dtype=float)
+    p = a * (1 - e**2)
+    alpha = (p - M * (3 + e**2)) / (M * p**2)
+    if np.any(alpha <= 0):
+        raise ValueError("no stable bound orbit: need a(1 - e^2) > (3 + e^2) M")
+    return 1 / (a * (1 - e)), np.zeros_like(p), alpha
+
+
+def circular_orbit(r, M=1.0):
+    """Initial (u0, w0, alpha) for a circular orbit at radius `r` (> 3M)."""
+    return bound_orbit(r, 0.0, M)
+
+
+def scatter_orbit(b, v_inf, r0, M=1.0):
+    """Initial (u0, w0, alpha) for a massive particle fired inward from `r0`
+    with speed `v_inf` at infinity and impact parameter `b`."""
+    b, v_inf = np.asarray(b, dtype=float), np.asarray(v_inf, dtype=float)
+    energy = 1 / np.sqrt(1 - v_inf**2)
+    alpha = 1 / (energy * v_inf * b)**2
+    u0 = 1 / np.asarray(r0, dtype=float)
+    w0 = np.sqrt(np.maximum(1 / (v_inf * b)**2 - (1 - 2 * M * u0) * (alpha + u0**2), 0.0))
+    return u0, w0, alpha
+
+
+def null_ray(b, r0, M=1.0):
+    """Initial (u0, w0, alpha) for light sent inward from `r0` with impact parameter `b`."""
+    b = np.asarray(b, dtype=float)
+    u0 = 1 / np.asarray(r0, dtype=float)
+    w0 = np.sqrt(np.maximum(1 / b**2 - (1 - 2 * M * u0) * u0**2, 0.0))
+    return u0, w0, np.zeros_like(b)
+
+
+def analytic_precession(a, e, M=1.0):
+    """Leading-order perihelion advance per orbit, 6 pi M / (a (1 - e^2))."""
+    return 6 * np.pi * M / (np.asarray(a) * (1 - np.asarray(e)**2))
+
+
+def periapsis_precession(a, e, M=1.0, rtol=1e-12, atol=1e-14, iterations=6):
+    """Numerical perihelion advance per orbit for a batch of bound orbits.
+
+    Integrates one full turn from periapsis, then finds the next zero of
+    w = du/dphi by Newton's method, each iterate integrating the short arc
+    past phi = 2 pi.
+    """
+    u0, w0, alpha = np.broadcast_arrays(*bound_orbit(a, e, M))
+    alpha = alpha.ravel()
+    turn = integrate(u0, w0, alpha, M, phi_end=2*np.pi, rtol=rtol, atol=atol)
+    if np.any(turn.status != FINISHED):
+        raise RuntimeError("orbit did not complete a full turn")
+    delta = np.broadcast_to(analytic_precession(a, e, M), alpha.shape).ravel()
+    for _ in range(iterations):
+        arc = integrate(turn.u_stop, turn.w_stop, alpha, M, phi_end=delta, rtol=rtol, atol=atol)
+        _, dw = _rhs(arc.u_stop, arc.w_stop, alpha, M)
+        delta = delta - arc.w_stop / dw
+    return delta.reshape(np.shape(u0))
+
+
+def benchmark_vectorization(n=2000, loop_sample=20, seed=0):
+    """Time one orbit for `n` particles as a batch versus one at a time.
+
+    The per-particle loop is timed on `loop_sample` particles and scaled
+    up to `n`. Returns a dict of timings, the speedup and the worst drift.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.uniform(10, 100, n)
+    e = rng.uniform(0, 0.7, n)
+    u0, w0, alpha = bound_orbit(a, e)
+
+    start = time.perf_counter()
+    batch = integrate(u0, w0, alpha, phi_end=2*np.pi)
+    t_batch = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(loop_sample):
+        integrate(u0[i], w0[i], alpha[i], phi_end=2*np.pi)
+    t_loop = (time.perf_counter() - start) * n / loop_sample
+
+    return {'n': n, 'batch_s': t_batch, 'loop_s': t_loop,
+            'speedup': t_loop / t_batch, 'max_drift': float(batch.drift.max())}
+
+
+def benchmark_precession(a=np.geomspace(20, 1e5, 9), e=0.3, M=1.0):
+    """Compare numerical perihelion advance with 6 pi M / (a (1 - e^2)).
+
+    The analytic result is the leading order in M/p (p = a(1 - e^2)), so its
+    relative error should fall like M/p; the residual after adding the
+    second-order term 3 pi (18 + e^2) / 2 (M/p)^2 should fall like (M/p)^2.
+    Returns one row per orbit.
+    """
+    a = np.asarray(a, dtype=float)
+    p = a * (1 - e**2)
+    numeric = periapsis_precession(a, e, M)
+    analytic = analytic_precession(a, e, M)
+    second = analytic + 1.5 * np.pi * (18 + e**2) * (M / p)**2
+    return [{'a': ai, 'numeric': ni, 'analytic': ai_, 'rel_err_analytic': (ni - ai_) / ai_,
+             'rel_err_second_order': (ni - si) / si}
+            for ai, ni, ai_, si in zip(a, numeric, analytic, second)]
+
+
+def main():
+    """Print the vectorization and precession-accuracy benchmarks."""
+    result = benchmark_vectorization()
+    print(f"{result['n']} orbits: batch {result['batch_s']:.3f}s, "
+          f"per-particle loop {result['loop_s']:.2f}s (est.), "
+          f"speedup {result['speedup']:.0f}x, max drift {result['max_drift']:.1e}")
+    print(f"\n{'a/M':>10} {'numeric':>12} {'6piM/p':>12} {'rel err':>10} {'vs 2nd order':>13}")
+    for row in benchmark_precession():
+        print(f"{row['a']:10.0f} {row['numeric']:12.6e} {row['analytic']:12.6e} "
+              f"{row['rel_err_analytic']:10.2e} {row['rel_err_second_order']:13.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+Black-Hole Metrics - Schwarzschild, Kerr and Reissner-Nordstrom
+===============================================================
+Closed-form metric, inverse, horizons, ergosphere, ISCO and clocks on broadcast grids.
+
+All three are members of the Kerr-Newman family (mass M, spin a = J/M,
+charge Q; geometric units G = c = 1). In Boyer-Lindquist coordinates,
+with
+
+    rho^2 = r^2 + a^2 cos^2(theta),   Delta = r^2 - 2 M r + a^2 + Q^2,
+    A = (r^2 + a^2)^2 - a^2 Delta sin^2(theta)
+
+the non-zero components and their inverse are
+
+    g_tt = -(1 - (2 M r - Q^2) / rho^2)      g^tt   = -A / (rho^2 Delta)
+    g_tp = -a sin^2 (2 M r - Q^2) / rho^2    g^tp   = -a (2 M r - Q^2) / (rho^2 Delta)
+    g_pp = A sin^2 / rho^2                   g^pp   = (Delta - a^2 sin^2) / (rho^2 Delta sin^2)
+    g_rr = rho^2 / Delta                     g^rr   = Delta / rho^2
+    g_thth = rho^2                           g^thth = 1 / rho^2
+
+so nothing is ever inverted numerically. Coordinates and parameters are
+ordinary broadcastable arrays: `Kerr(a=spins[:, None, None])` evaluated at
+`r[None, :, None]`, `theta[None, None, :]` fills a (spin, r, theta) cube in
+one call. `kerr_newman_metric` has the `tensors` metric signature, so the
+same components feed `tensors.Curvature` for derivatives.
+"""
+
+import time
+
+import numpy as np
+
+
+def kerr_newman_metric(t, r, theta, phi, M=1.0, a=0.0, Q=0.0):
+    """Kerr-Newman metric components {(mu, nu): g_mu_nu} in Boyer-Lindquist coordinates.
+
+    g_rr is infinite on the horizons (Delta = 0), without a warning.
+    """
+    rho2 = r**2 + (a * np.cos(theta))**2
+    sin2 = np.sin(theta)**2
+    mass = 2 * M * r - Q**2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        g_rr = rho2 / (r**2 - 2 * M * r + a**2 + Q**2)
+    return {(0, 0): -(1 - mass / rho2),
+            (0, 3): -a * mass * sin2 / rho2,
+            (1, 1): g_rr,
+            (2, 2): rho2,
+            (3, 3): (r**2 + a**2 + a**2 * mass * sin2 / rho2) * sin2}
+
+
+def _dense(components, shape):
+    """(..., 4, 4) array from a dict of upper-triangle components."""
+    g = np.zeros(shape + (4, 4))
+    for (i, j), value in components.items():
+        g[..., i, j] = g[..., j, i] = value
+    return g
+
+
+class Metric:
+    """A Kerr-Newman black hole; M, a and Q may be arrays that broadcast with the coordinates."""
+
+    def __init__(self, M=1.0, a=0.0, Q=0.0):
+        self.M, self.a, self.Q = (np.asarray(p, dtype=float) for p in (M, a, Q))
+
+    def _terms(self, r, theta):
+        r, theta = np.asarray(r, dtype=float), np.asarray(theta, dtype=float)
+        a2 = self.a**2
+        sin2 = np.sin(theta)**2
+        rho2 = r**2 + a2 * np.cos(theta)**2
+        delta = r**2 - 2 * self.M * r + a2 + self.Q**2
+        mass = 2 * self.M * r - self.Q**2
+        return r, sin2, rho2, delta, mass
+
+    def components(self, r, theta):
+        """Non-zero g_mu_nu (mu <= nu) at (r, theta), as a dict of arrays."""
+        return kerr_newman_metric(0.0, np.asarray(r, dtype=float), np.asarray(theta, dtype=float),
+                                  0.0, self.M, self.a, self.Q)
+
+    def g_tt(self, r, theta):
+        """g_tt alone, which unlike g_rr stays finite on the horizons."""
+        r, sin2, rho2, delta, mass = self._terms(r, theta)
+        return -(1 - mass / rho2)
+
+    def g_tphi(self, r, theta):
+        """g_tphi alone, the frame-dragging term (finite on the horizons)."""
+        r, sin2, rho2, delta, mass = self._terms(r, theta)
+        return -self.a * mass * sin2 / rho2
+
+    def inverse_components(self, r, theta):
+        """Non-zero g^mu_nu (mu <= nu) at (r, theta), in closed form."""
+        r, sin2, rho2, delta, mass = self._terms(r, theta)
+        a = self.a
+        big_a = (r**2 + a**2)**2 - a**2 * delta * sin2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return {(0, 0): -big_a / (rho2 * delta),
+                    (0, 3): -a * mass / (rho2 * delta),
+                    (1, 1): delta / rho2,
+                    (2, 2): 1 / rho2,
+                    (3, 3): (delta - a**2 * sin2) / (rho2 * delta * sin2)}
+
+    def metric(self, r, theta):
+        """g_mu_nu as a (..., 4, 4) array over the broadcast grid."""
+        components = self.components(r, theta)
+        return _dense(components, np.broadcast_shapes(*(np.shape(v) for v in components.values())))
+
+    def inverse_metric(self, r, theta):
+        """g^mu_nu as a (..., 4, 4) array over the broadcast grid."""
+        components = self.inverse_components(r, theta)
+        return _dense(components, np.broadcast_shapes(*(np.shape(v) for v in components.values())))
+
+    def horizons(self):
+        """(r_+, r_-): outer and inner horizon radii, NaN for a naked singularity."""
+        with np.errstate(invalid='ignore'):
+            root = np.sqrt(self.M**2 - self.a**2 - self.Q**2)
+        return self.M + root, self.M - root
+
+    def ergosphere(self, theta):
+        """Outer boundary of the ergosphere (g_tt = 0) at polar angle theta."""
+        with np.errstate(invalid='ignore'):
+            return self.M + np.sqrt(self.M**2 - self.Q**2 - (self.a * np.cos(theta))**2)
+
+    def isco(self, prograde=True):
+        """Radius of the innermost stable circular orbit in the equatorial plane.
+
+        Closed form (Bardeen, Press & Teukolsky) for Kerr; for
+        Reissner-Nordstrom the largest root of
+        r^3 - 6 M r^2 + 9 Q^2 r - 4 Q^4 / M = 0, by Newton's method from
+        6M, where the cubic is convex. Raises ValueError for charged,
+        spinning holes, which have no such closed form or cubic.
+        """
+        M, a, Q = np.broadcast_arrays(self.M, self.a, self.Q)
+        if np.any((a != 0) & (Q != 0)):
+            raise ValueError("isco() covers Kerr (Q = 0) and Reissner-Nordstrom (a = 0) holes, "
+                             "not charged spinning (Kerr-Newman) ones")
+        chi = np.abs(a) / M
+        z1 = 1 + np.cbrt(1 - chi**2) * (np.cbrt(1 + chi) + np.cbrt(1 - chi))
+        z2 = np.sqrt(3 * chi**2 + z1**2)
+        sign = -1 if prograde else 1
+        kerr = M * (3 + z2 + sign * np.sqrt((3 - z1) * (3 + z1 + 2 * z2)))
+
+        r = 6 * M
+        for _ in range(100):
+            f = r**3 - 6 * M * r**2 + 9 * Q**2 * r - 4 * Q**4 / M
+            step = f / (3 * r**2 - 12 * M * r + 9 * Q**2)
+            r = r - step
+            if np.all(np.abs(step) <= 1e-14 * r):
+                break
+        return np.where(Q != 0, r, kerr)
+
+    def frame_dragging(self, r, theta):
+        """Angular velocity omega = -g_tp / g_pp of zero-angular-momentum observers."""
+        r, sin2, rho2, delta, mass = self._terms(r, theta)
+        return self.a * mass / ((r**2 + self.a**2)**2 - self.a**2 * delta * sin2)
+
+    def time_dilation(self, r, theta, observer='static'):
+        """Clock rate dtau/dt relative to infinity.
+
+        'static' observers hover at fixed (r, theta, phi): sqrt(-g_tt), NaN
+        inside the ergosphere where they cannot exist. 'zamo' observers
+        co-rotate with the frame dragging: the lapse 1 / sqrt(-g^tt),
+        defined down to the outer horizon.
+        """
+        if observer == 'static':
+            with np.errstate(invalid='ignore'):
+                return np.sqrt(-self.g_tt(r, theta))
+        if observer == 'zamo':
+            r, sin2, rho2, delta, mass = self._terms(r, theta)
+            big_a = (r**2 + self.a**2)**2 - self.a**2 * delta * sin2
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return np.where(r > self.horizons()[0], np.sqrt(rho2 * delta / big_a), np.nan)
+        raise ValueError(f"unknown observer {observer!r} (use 'static' or 'zamo')")
+
+
+class Schwarzschild(Metric):
+    """Non-rotating, uncharged black hole of mass M."""
+
+    def __init__(self, M=1.0):
+        super().__init__(M)
+
+
+class Kerr(Metric):
+    """Rotating black hole of mass M and spin a = J/M."""
+
+    def __init__(self, M=1.0, a=0.0):
+        super().__init__(M, a=a)
+
+
+class ReissnerNordstrom(Metric):
+    """Charged, non-rotating black hole of mass M and charge Q."""
+
+    def __init__(self, M=1.0, Q=0.0):
+        super().__init__(M, Q=Q)
+
+
+def benchmark_inverse(shape=(64, 256, 128), loop_sample=2000, seed=0):
+    """Closed-form inverse vs np.linalg.inv on a (spin, r, theta) Kerr grid.
+
+    Times the closed form, batched np.linalg.inv over the whole stack, and
+    a per-point np.linalg.inv loop on `loop_sample` random points
+    (extrapolated to the grid). Returns a dict of seconds, speedups and
+    the largest relative deviation of the batched numerical inverse.
+    """
+    n_spin, n_r, n_theta = shape
+    kerr = Kerr(1.0, np.linspace(0.0, 0.99, n_spin)[:, None, None])
+    r = np.linspace(2.5, 50.0, n_r)[None, :, None]
+    theta = np.linspace(0.05, np.pi - 0.05, n_theta)[None, None, :]
+
+    start = time.perf_counter()
+    closed = kerr.inverse_metric(r, theta)
+    t_closed = time.perf_counter() - start
+
+    g = kerr.metric(r, theta)
+    start = time.perf_counter()
+    batched = np.linalg.inv(g)
+    t_batched = time.perf_counter() - start
+
+    flat = g.reshape(-1, 4, 4)
+    picks = np.random.default_rng(seed).choice(len(flat), min(loop_sample, len(flat)), replace=False)
+    start = time.perf_counter()
+    for i in picks:
+        np.linalg.inv(flat[i])
+    t_loop = (time.perf_counter() - start) * len(flat) / len(picks)
+
+    scale = np.abs(closed).max(axis=(-2, -1), keepdims=True)
+    error = float(np.max(np.abs(batched - closed) / scale))
+    return {'points': int(np.prod(shape)), 'closed_form': t_closed, 'batched_inv': t_batched,
+            'per_point_inv': t_loop, 'speedup_batched': t_batched / t_closed,
+            'speedup_per_point': t_loop / t_closed, 'max_rel_diff': error}
+
+
+def main():
+    """Print horizons/ISCO for a few holes and the inverse-metric benchmark."""
+    print(f"{'hole':<28} {'r_+':>7} {'r_-':>7} {'ISCO pro':>9} {'ISCO retro':>10} {'r_E(eq)':>8}")
+    holes = [("Schwarzschild", Schwarzschild()), ("Kerr a=0.5", Kerr(a=0.5)),
+             ("Kerr a=0.9", Kerr(a=0.9)), ("Kerr a=0.998", Kerr(a=0.998)),
+             ("Reissner-Nordstrom Q=0.5", ReissnerNordstrom(Q=0.5)),
+             ("Reissner-Nordstrom Q=1", ReissnerNordstrom(Q=1.0))]
+    for name, hole in holes:
+        r_plus, r_minus = hole.horizons()
+        print(f"{name:<28} {r_plus:7.4f} {r_minus:7.4f} {hole.isco():9.4f} "
+              f"{hole.isco(prograde=False):10.4f} {hole.ergosphere(np.pi / 2):8.4f}")
+
+    result = benchmark_inverse()
+    print(f"\nInverse metric on {result['points']:,} points (spin x r x theta):")
+    print(f"  closed form      {result['closed_form'] * 1e3:9.1f} ms")
+    print(f"  np.linalg.inv    {result['batched_inv'] * 1e3:9.1f} ms  "
+          f"({result['speedup_batched']:.0f}x slower, max rel. diff {result['max_rel_diff']:.1e})")
+    print(f"  per-point inv    {result['per_point_inv'] * 1e3:9.1f} ms  "
+          f"({result['speedup_per_point']:.0f}x slower, extrapolated)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Render Profiling - Per-Phase Timing and Memory
+==============================================
+Where the time goes inside a figure: data generation, artists, layout, encoding.
+
+Figure functions mark their phases with `phase(name)` blocks. Outside a
+`record()` block these cost nothing. Inside one, every stretch of the
+figure is booked to a phase:
+
+- 'data'     numerical work (grids, geodesics, lensing, waveforms, ...)
+- 'artists'  everything not in a named phase: axes, plots, patches, text
+- 'layout'   tight_layout
+- 'savefig'  drawing and encoding the image at the output dpi
+
+and each phase accumulates wall time, CPU time, its tracemalloc peak
+(when tracing memory) and the process peak RSS at its end. `record()`
+can also run the figure under cProfile and dump the stats to a file,
+readable with `python -m pstats`.
+"""
+
+import contextlib
+import cProfile
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PHASES = ('data', 'artists', 'layout', 'savefig')
+DEFAULT_PHASE = 'artists'
+
+_active = None
+
+
+def peak_rss_mb():
+    """High-water resident set size of this process in MB (None if unavailable)."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024**2 if sys.platform == 'darwin' else rss / 1024  # bytes on macOS, else KB
+
+
+class Recorder:
+    """Per-phase wall time, CPU time and peak memory of one figure."""
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.phases = {}
+        self.wall = self.cpu = 0.0
+        self._mark = None
+
+    def _start(self):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        self._mark = (time.perf_counter(), time.process_time())
+        self._begin = self._mark
+
+    def _close(self, name):
+        """Book the stretch since the last boundary to phase `name`."""
+        wall, cpu = time.perf_counter(), time.process_time()
+        entry = self.phases.setdefault(name, {'calls': 0, 'wall': 0.0, 'cpu': 0.0})
+        entry['calls'] += 1
+        entry['wall'] += wall - self._mark[0]
+        entry['cpu'] += cpu - self._mark[1]
+        if self.trace_memory:
+            peak = tracemalloc.get_traced_memory()[1] / 1e6
+            entry['peak_traced_mb'] = max(entry.get('peak_traced_mb', 0.0), peak)
+            tracemalloc.reset_peak()
+        entry['peak_rss_mb'] = peak_rss_mb()
+        self._mark = (time.perf_counter(), time.process_time())
+
+    def _finish(self):
+        self._close(DEFAULT_PHASE)
+        self.wall = self._mark[0] - self._begin[0]
+        self.cpu = self._mark[1] - self._begin[1]
+
+    def report(self):
+        """JSON-ready dict: totals plus the phases in PHASES order."""
+        order = {name: i for i, name in enumerate(PHASES)}
+        phases = dict(sorted(self.phases.items(), key=lambda kv: order.get(kv[0], len(order))))
+        result = {'wall': self.wall, 'cpu': self.cpu, 'peak_rss_mb': peak_rss_mb(), 'phases': phases}
+        if self.trace_memory:
+            result['peak_traced_mb'] = max((p['peak_traced_mb'] for p in phases.values()), default=0.0)
+        return result
+
+
+@contextlib.contextmanager
+def phase(name):
+    """Book the enclosed block to phase `name` of the figure being recorded."""
+    if _active is None:
+        yield
+        return
+    _active._close(DEFAULT_PHASE)
+    try:
+        yield
+    finally:
+        _active._close(name)
+
+
+@contextlib.contextmanager
+def record(trace_memory=False, profile=None):
+    """Record the phases of the enclosed figure; yields the Recorder.
+
+    With `trace_memory`, tracemalloc runs for the duration (it slows
+    allocation-heavy code noticeably). With `profile` set to a path, the
+    block also runs under cProfile and the stats are dumped there.
+    """
+    global _active
+    recorder = Recorder(trace_memory)
+    tracing = trace_memory and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    profiler = cProfile.Profile() if profile else None
+    _active = recorder
+    recorder._start()
+    if profiler:
+        profiler.enable()
+    try:
+        yield recorder
+    finally:
+        if profiler:
+            profiler.disable()
+        recorder._finish()
+        _active = None
+        if tracing:
+            tracemalloc.stop()
+        if profiler:
+            profiler.dump_stats(profile)
@@ -0,0 +1,275 @@
+"""
+Figure Server - In-Memory Rendering over HTTP
+=============================================
+A small WSGI app that renders the registered figures on request.
+
+    GET /figures                          JSON list of figures, formats and profiles
+    GET /figures/<key>.<format>           the image (png, svg, webp, pdf)
+        ?profile=web&dpi=150              quality profile and dpi override
+        ?width=1200&height=800            fit the image inside this many pixels
+                                          (at most MAX_IMAGE_PIXELS in all)
+    GET /stats                            cache and pool statistics
+
+Figures render in a pool of worker processes that import numpy,
+matplotlib and the numerical modules (and load the lensing deflection
+table) once, when they start, so a request pays only for drawing and
+encoding. Results are kept in an LRU cache bounded by total bytes, and
+concurrent requests for the same image share one render; the arrays
+behind them are memoized on disk (`visualizations.figure_data`), so a new
+size or format of a figure does not recompute its data.
+
+    python server.py --port 8000 --workers 2 --cache-mb 256
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs
+from wsgiref.simple_server import WSGIServer, make_server
+
+import visualizations
+
+FIGURES = {figure.key: figure for figure in visualizations.FIGURES}
+MAX_PIXELS = 10000
+MAX_IMAGE_PIXELS = 40_000_000   # width * height, whatever dpi or size produced it
+DPI_RANGE = (10, 1200)
+
+
+def _warm_worker():
+    """Process-pool initializer: select Agg, open the data cache, import everything a render needs."""
+    visualizations._init_worker()
+    import matplotlib.pyplot  # noqa: F401
+    import numpy  # noqa: F401
+
+    import figuredata  # noqa: F401
+    import lensing
+
+    lensing.deflection_table()
+
+
+def _ready():
+    return os.getpid()
+
+
+def _render(key, profile, fmt, dpi, size):
+    """Worker task: render one figure; returns (data, metadata)."""
+    start = time.perf_counter()
+    params = {'dpi': dpi} if dpi else None
+    data, metadata = visualizations.render_figure(FIGURES[key], params, fmt, size, profile,
+                                                  MAX_IMAGE_PIXELS)
+    metadata['seconds'] = time.perf_counter() - start
+    return data, metadata
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache bounded by the total size of its values."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._items:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return self._items[key][0]
+
+    def put(self, key, value, size):
+        """Store `value`, which occupies `size` bytes; values larger than the bound are not kept."""
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._items:
+                self.bytes -= self._items.pop(key)[1]
+            self._items[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted) = self._items.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._items), 'bytes': self.bytes, 'max_bytes': self.max_bytes,
+                    'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+
+class FigureServer:
+    """WSGI application serving rendered figures from a warm process pool."""
+
+    def __init__(self, workers=2, cache_bytes=256 * 2**20):
+        self.workers = workers
+        self.cache = LRUCache(cache_bytes)
+        self.restarts = 0
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.pool = self._start_pool()
+
+    def _start_pool(self):
+        pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+        # start every worker now rather than on the first requests
+        for future in [pool.submit(_ready) for _ in range(self.workers)]:
+            future.result()
+        return pool
+
+    def _restart_pool(self, broken):
+        """Replace `broken`, a pool a worker died in, unless already done (lock held)."""
+        if self.pool is broken:
+            self.pool = self._start_pool()
+            self.restarts += 1
+            broken.shutdown(wait=False)
+
+    def _submit(self, request):
+        """(pool, future) for a render; a pool whose worker died while idle is replaced first (lock held)."""
+        try:
+            return self.pool, self.pool.submit(_render, *request)
+        except BrokenProcessPool:
+            self._restart_pool(self.pool)
+            return self.pool, self.pool.submit(_render, *request)
+
+    def close(self):
+        self.pool.shutdown()
+
+    def render(self, key, profile='web', fmt='png', dpi=None, size=None):
+        """(data, metadata, cache hit?) for one image, rendering it at most once.
+
+        If a worker dies during the render, the request raises
+        BrokenProcessPool and the pool is replaced, so later requests
+        render again.
+        """
+        request = (key, profile, fmt, dpi, size)
+        cached = self.cache.get(request)
+        if cached is not None:
+            return (*cached, True)
+        with self._lock:
+            if request not in self._inflight:
+                self._inflight[request] = self._submit(request)
+            pool, future = self._inflight[request]
+        try:
+            data, metadata = future.result()
+        except BrokenProcessPool:
+            with self._lock:
+                self._restart_pool(pool)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(request, None)
+        self.cache.put(request, (data, metadata), len(data))
+        return data, metadata, False
+
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO', '/').rstrip('/') or '/'
+        if environ.get('REQUEST_METHOD', 'GET') not in ('GET', 'HEAD'):
+            return self._json(start_response, '405 Method Not Allowed', {'error': 'GET only'})
+        if path in ('/', '/figures'):
+            return self._json(start_response, '200 OK', self.index())
+        if path == '/stats':
+            return self._json(start_response, '200 OK',
+                              {'workers': self.workers, 'restarts': self.restarts,
+                               'cache': self.cache.stats()})
+        if path.startswith('/figures/'):
+            return self._figure(environ, start_response, path[len('/figures/'):])
+        return self._json(start_response, '404 Not Found', {'error': f'no route {path}'})
+
+    def index(self):
+        return {'figures': [{'key': f.key, 'title': f.title, 'dpi': f.dpi,
+                             'url': f'/figures/{f.key}.png'} for f in FIGURES.values()],
+                'formats': list(visualizations.FORMATS),
+                'profiles': list(visualizations.PROFILES)}
+
+    def _figure(self, environ, start_response, name):
+        key, _, fmt = name.rpartition('.')
+        if key not in FIGURES:
+            return self._json(start_response, '404 Not Found', {'error': f'unknown figure {key!r}'})
+        try:
+            profile, dpi, size = self._parse_query(environ.get('QUERY_STRING', ''))
+            if fmt not in visualizations.FORMATS:
+                raise ValueError(f"unsupported format {fmt!r}")
+        except ValueError as e:
+            return self._json(start_response, '400 Bad Request', {'error': str(e)})
+        try:
+            data, metadata, hit = self.render(key, profile, fmt, dpi, size)
+        except ValueError as e:  # e.g. over MAX_IMAGE_PIXELS
+            return self._json(start_response, '400 Bad Request', {'error': str(e)})
+        except Exception as e:
+            return self._json(start_response, '500 Internal Server Error',
+                              {'error': f'{type(e).__name__}: {e}'})
+
+        etag = '"' + hashlib.sha256(data).hexdigest()[:32] + '"'
+        headers = [('Content-Type', metadata['mime']), ('ETag', etag),
+                   ('Cache-Control', 'public, max-age=3600'),
+                   ('X-Cache', 'HIT' if hit else 'MISS'),
+                   ('X-Render-Seconds', f"{metadata['seconds']:.3f}")]
+        if metadata['width']:
+            headers += [('X-Image-Width', str(metadata['width'])),
+                        ('X-Image-Height', str(metadata['height']))]
+        if environ.get('HTTP_IF_NONE_MATCH') == etag:
+            start_response('304 Not Modified', headers)
+            return [b'']
+        start_response('200 OK', headers + [('Content-Length', str(len(data)))])
+        return [b''] if environ.get('REQUEST_METHOD') == 'HEAD' else [data]
+
+    @staticmethod
+    def _parse_query(query):
+        """(profile, dpi or None, (width, height) or None) from a query string."""
+        args = {k: v[-1] for k, v in parse_qs(query).items()}
+        profile = args.get('profile', visualizations.DEFAULT_PROFILE)
+        if profile not in visualizations.PROFILES:
+            raise ValueError(f"unknown profile {profile!r}")
+        dpi = float(args['dpi']) if 'dpi' in args else None
+        if dpi is not None and not DPI_RANGE[0] <= dpi <= DPI_RANGE[1]:
+            raise ValueError(f"dpi must be within {DPI_RANGE}")
+        size = tuple(int(args[k]) if k in args else None for k in ('width', 'height'))
+        if any(px is not None and not 16 <= px <= MAX_PIXELS for px in size):
+            raise ValueError(f"width and height must be within 16..{MAX_PIXELS}")
+        return profile, dpi, size if any(size) else None
+
+    @staticmethod
+    def _json(start_response, status, payload):
+        body = json.dumps(payload, indent=2).encode()
+        start_response(status, [('Content-Type', 'application/json'),
+                                ('Content-Length', str(len(body)))])
+        return [body]
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    """wsgiref server handling each request in its own thread."""
+    daemon_threads = True
+
+
+def main(argv=None):
+    """Command line: serve figures over HTTP."""
+    parser = argparse.ArgumentParser(description="Serve General Relativity figures over HTTP.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('-w', '--workers', type=int, default=2, help="render processes")
+    parser.add_argument('--cache-mb', type=float, default=256, help="LRU cache size in MB")
+    args = parser.parse_args(argv)
+
+    app = FigureServer(args.workers, int(args.cache_mb * 2**20))
+    with make_server(args.host, args.port, app, server_class=ThreadingWSGIServer) as httpd:
+        print(f"✓ Serving {len(FIGURES)} figures on http://{args.host}:{args.port}/figures "
+              f"({args.workers} workers, {args.cache_mb:g} MB cache)")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            app.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,389 @@
+"""
+Parameter Sweeps - Data Cubes and Small Multiples
+=================================================
+One figure per configuration is fine for the README; teaching material
+and papers need the same physics across many masses, spins or
+eccentricities.
+
+A sweep takes a range for each of its parameters, computes the data for
+every combination in one broadcast NumPy pass (one batched geodesic
+integration, one TaylorF2 bank, one metric evaluation) and stores it as
+a compressed .npz data cube: each parameter and each data array has the
+shape of the parameter grid, data arrays with a trailing sample axis.
+Figures are then drawn from the cube, never by recomputing:
+
+- small multiples, one panel per configuration, `per_page` panels per
+  image, pages rendered in parallel
+- frames, one image per configuration (for slides or an animation),
+  rendered in parallel
+
+Panels in one sweep share their axis limits so they can be compared.
+
+    python sweeps.py --list
+    python sweeps.py time_dilation M=0.5:2:50
+    python sweeps.py orbits e=0:0.8:100 --frames -j 4
+    python sweeps.py kerr a=0:0.998:25 --cube visualizations/sweeps/kerr.npz
+"""
+
+import argparse
+import json
+import os
+import time
+import zipfile
+from collections import namedtuple
+
+import numpy as np
+
+OUTPUT_DIR = 'visualizations/sweeps'
+CUBE_VERSION = 1
+
+
+# Sweep computations: compute(**params) receives every parameter as a 1D
+# array over the flattened grid and returns {name: array}, with one row
+# per configuration (plus shared 1D coordinate arrays).
+
+def _time_dilation(M, n=400):
+    import metrics
+
+    r = np.linspace(0.1, 20, n)
+    hole = metrics.Schwarzschild(M[:, None])
+    return {'r': r,
+            'g_tt': hole.components(r, np.pi / 2)[(0, 0)],
+            'dilation': hole.time_dilation(r, np.pi / 2),
+            'r_s': 2 * M}
+
+
+def _kerr(a, M, n=400):
+    import metrics
+
+    r = np.linspace(0.5, 10, n)
+    hole = metrics.Kerr(M, a * M)
+    r_plus, r_minus = hole.horizons()
+    return {'r': r,
+            'lapse': metrics.Kerr(M[:, None], (a * M)[:, None]).time_dilation(r, np.pi / 2, 'zamo'),
+            'r_plus': r_plus, 'r_minus': r_minus,
+            'ergosphere': hole.ergosphere(np.pi / 2),
+            'isco': hole.isco(), 'isco_retrograde': hole.isco(prograde=False)}
+
+
+def _orbits(e, a, M, turns=2, n=600):
+    import geodesics
+
+    phi = np.linspace(0, 2 * np.pi * turns, n)
+    x, y = np.empty((2, e.size, n))
+    precession = np.empty(e.size)
+    # the integrator takes one M per batch, so batch each distinct mass
+    for mass in np.unique(M):
+        rows = M == mass
+        sol = geodesics.integrate(*geodesics.bound_orbit(a[rows], e[rows], mass), mass,
+                                  phi_end=2 * np.pi * turns, phi_eval=phi)
+        x[rows], y[rows] = (c.T for c in geodesics.to_cartesian(phi, sol.u))
+        precession[rows] = geodesics.periapsis_precession(a[rows], e[rows], mass)
+    return {'phi': phi, 'x': x, 'y': y, 'precession_deg': np.degrees(precession)}
+
+
+def _chirps(m1, m2, window=0.3, sample_rate=4096, duration=4.0, f_low=20.0):
+    import waveforms
+
+    n = int(duration * sample_rate)
+    f = np.fft.rfftfreq(n, 1 / sample_rate)
+    t_c = duration - 0.1
+    hp, _ = waveforms.taylorf2(f, m1, m2, t_c=t_c)
+    # start each chirp late enough (Newtonian chirp time <= duration / 2)
+    # that the inverse FFT does not wrap light, long inspirals around
+    mchirp = (m1 * m2)**0.6 / (m1 + m2)**0.2 * waveforms.MSUN_S
+    f_start = np.maximum(f_low, (256 / 5 * duration / 2)**-0.375 * mchirp**-0.625 / np.pi)
+    hp[f < f_start[:, None]] = 0
+    strain = np.fft.irfft(hp, n, axis=-1) * sample_rate
+    keep = slice(n - int((window + 0.1) * sample_rate), n - int(0.05 * sample_rate))
+    strain = strain[:, keep]
+    return {'t': np.arange(n)[keep] / sample_rate - t_c,
+            'strain': strain / np.abs(strain).max(axis=1, keepdims=True),
+            'f_isco': waveforms.isco_frequency(m1, m2)}
+
+
+# Panel painters: draw(ax, cube, i) draws configuration i (a flat index)
+# on `ax`.
+
+def _draw_time_dilation(ax, cube, i):
+    ax.plot(cube['r'], cube['dilation'][i], 'g-', lw=2)
+    ax.axvline(cube['r_s'][i], color='orange', ls='--', lw=1)
+    ax.axhline(1, color='b', ls=':', lw=1)
+
+
+def _draw_kerr(ax, cube, i):
+    ax.plot(cube['r'], cube['lapse'][i], 'm-', lw=2)
+    ax.axvline(cube['r_plus'][i], color='k', ls='--', lw=1)
+    ax.axvline(cube['ergosphere'][i], color='k', ls=':', lw=1)
+    ax.axvline(cube['isco'][i], color='g', ls='-.', lw=1)
+
+
+def _draw_orbits(ax, cube, i):
+    ax.plot(cube['x'][i], cube['y'][i], 'r-', lw=1.5)
+    ax.plot(0, 0, 'o', color='gold', mec='orange')
+    ax.set_aspect('equal')
+
+
+def _draw_chirps(ax, cube, i):
+    ax.plot(cube['t'], cube['strain'][i], 'b-', lw=1)
+
+
+def _panel_label(cube, i, names):
+    parts = []
+    for name in names:
+        if np.ptp(cube[name]) > 0:
+            parts.append(f"{name} = {cube[name].flat[i]:.3g}")
+    return ', '.join(parts) or ', '.join(f"{name} = {cube[name].flat[0]:.3g}" for name in names)
+
+
+# A sweep: key, title, parameter defaults (name -> values), compute, the
+# names of its shared coordinate arrays, draw, axis labels and fixed
+# limits (None = shared by all panels, from the data).
+Sweep = namedtuple('Sweep', 'key title params compute coords draw xlabel ylabel xlim ylim')
+
+SWEEPS = [
+    Sweep('time_dilation', 'Schwarzschild Time Dilation vs Mass',
+          {'M': np.linspace(0.5, 2.0, 16)}, _time_dilation, ('r',), _draw_time_dilation,
+          'r', '$d\\tau/dt$', (0, 20), (0, 1.05)),
+    Sweep('kerr', 'Kerr ZAMO Clock Rate vs Spin',
+          {'a': np.linspace(0.0, 0.99, 16), 'M': [1.0]}, _kerr, ('r',), _draw_kerr,
+          'r / M', '$d\\tau/dt$ (ZAMO)', (0, 10), (0, 1.0)),
+    Sweep('orbits', 'Precessing Orbits vs Eccentricity',
+          {'e': np.linspace(0.0, 0.8, 16), 'a': [4.0], 'M': [0.02]}, _orbits, ('phi',), _draw_orbits,
+          'x', 'y', None, None),
+    Sweep('chirps', 'Inspiral Chirps vs Mass',
+          {'m1': np.linspace(5.0, 50.0, 16), 'm2': [10.0]}, _chirps, ('t',), _draw_chirps,
+          't - $t_c$ (s)', '$h_+$ (normalized)', None, (-1.1, 1.1)),
+]
+
+SWEEPS_BY_KEY = {sweep.key: sweep for sweep in SWEEPS}
+
+
+def parse_range(spec):
+    """Parameter values from 'start:stop:num', 'a,b,c' or a single number."""
+    if ':' in spec:
+        start, stop, num = spec.split(':')
+        return np.linspace(float(start), float(stop), int(num))
+    return np.array([float(v) for v in spec.split(',')])
+
+
+def _range_arg(spec):
+    """argparse type for NAME=RANGE: (name, values), or a usage error."""
+    name, sep, values = spec.partition('=')
+    if not sep or not name:
+        raise argparse.ArgumentTypeError(f"expected NAME=RANGE, got {spec!r}")
+    try:
+        values = parse_range(values)
+    except ValueError:
+        values = np.empty(0)
+    if values.size == 0:
+        raise argparse.ArgumentTypeError(f"bad range {spec!r}: use start:stop:num, a,b,c or a number")
+    return name, values
+
+
+def compute(sweep, **ranges):
+    """Data cube for `sweep` over the grid of its parameter ranges.
+
+    Missing parameters take the sweep's defaults. Returns {name: array}:
+    each parameter with the grid shape, each per-configuration result
+    with the grid shape plus its sample axis, and shared coordinates
+    (such as the radial grid) as they are.
+    """
+    unknown = set(ranges) - set(sweep.params)
+    if unknown:
+        raise ValueError(f"{sweep.key} has no parameter(s) {', '.join(sorted(unknown))}; "
+                         f"use {', '.join(sweep.params)}")
+    values = [np.atleast_1d(np.asarray(ranges.get(name, default), dtype=float))
+              for name, default in sweep.params.items()]
+    grid = np.meshgrid(*values, indexing='ij')
+    shape = grid[0].shape
+    flat = {name: g.ravel() for name, g in zip(sweep.params, grid)}
+    data = sweep.compute(**flat)
+    cube = {name: g for name, g in zip(sweep.params, grid)}
+    for name, array in data.items():
+        array = np.asarray(array)
+        if name not in sweep.coords:
+            array = array.reshape(shape + array.shape[1:])
+        cube[name] = array
+    return cube
+
+
+def save_cube(path, sweep, cube):
+    """Write `cube` as a compressed .npz with its sweep and grid recorded in `__meta__`."""
+    meta = {'version': CUBE_VERSION, 'sweep': sweep.key, 'params': list(sweep.params),
+            'shape': list(cube[next(iter(sweep.params))].shape),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S%z')}
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    np.savez_compressed(path, __meta__=json.dumps(meta), **cube)
+
+
+def load_cube(path):
+    """(sweep, cube, meta) from a file written by `save_cube`."""
+    with np.load(path) as f:
+        meta = json.loads(str(f['__meta__']))
+        cube = {name: f[name] for name in f.files if name != '__meta__'}
+    if meta.get('version') != CUBE_VERSION:
+        raise ValueError(f"{path}: unsupported cube version {meta.get('version')}")
+    return SWEEPS_BY_KEY[meta['sweep']], cube, meta
+
+
+def _flat_cube(sweep, cube):
+    """The cube with the parameter grid flattened, so panel i is row i."""
+    n = cube[next(iter(sweep.params))].size
+    shape = cube[next(iter(sweep.params))].shape
+    return {name: a if name in sweep.coords else a.reshape((n,) + a.shape[len(shape):])
+            for name, a in cube.items()}
+
+
+def _limits(sweep, cube, draw_indices):
+    """Shared (xlim, ylim) for the panels, from the sweep or the data."""
+    import matplotlib.pyplot as plt
+
+    if sweep.xlim is not None and sweep.ylim is not None:
+        return sweep.xlim, sweep.ylim
+    fig, ax = plt.subplots()
+    for i in draw_indices:
+        sweep.draw(ax, cube, i)
+    ax.autoscale()
+    limits = (sweep.xlim or ax.get_xlim(), sweep.ylim or ax.get_ylim())
+    plt.close(fig)
+    return limits
+
+
+_cube = None
+
+
+def _load(path):
+    """Load the cube at `path` as the one `_render_page` draws from."""
+    global _cube
+    sweep, cube, _ = load_cube(path)
+    _cube = (sweep, _flat_cube(sweep, cube))
+
+
+def _load_worker(path):
+    """Process-pool initializer: select Agg and load the cube once per worker."""
+    import visualizations
+
+    visualizations._init_worker()
+    _load(path)
+
+
+def _render_page(indices, out_path, limits, dpi, columns):
+    """Draw the configurations `indices` as one image (a page of panels, or one frame)."""
+    import matplotlib.pyplot as plt
+
+    import visualizations
+
+    sweep, cube = _cube
+    rows = -(-len(indices) // columns)
+    size = (4.0 * columns, 3.2 * rows) if len(indices) > 1 else (8, 6)
+    with plt.rc_context(visualizations.STYLE):
+        fig, axes = plt.subplots(rows, columns, figsize=size, squeeze=False,
+                                 sharex=True, sharey=True)
+        for ax in axes.flat[len(indices):]:
+            ax.set_visible(False)
+        for ax, i in zip(axes.flat, indices):
+            sweep.draw(ax, cube, i)
+            ax.set_xlim(*limits[0])
+            ax.set_ylim(*limits[1])
+            ax.set_title(_panel_label(cube, i, sweep.params), fontsize=10)
+            ax.grid(alpha=0.3)
+        for ax in axes[-1]:
+            ax.set_xlabel(sweep.xlabel)
+        for ax in axes[:, 0]:
+            ax.set_ylabel(sweep.ylabel)
+        fig.suptitle(sweep.title, fontweight='bold')
+        fig.tight_layout()
+        fig.savefig(out_path, dpi=dpi)
+        plt.close(fig)
+    return out_path
+
+
+def render(cube_path, out_dir=OUTPUT_DIR, frames=False, per_page=16, columns=4, dpi=100, jobs=1):
+    """Render small multiples (or one frame per configuration) from a saved cube.
+
+    Pages (or frames) are independent and are drawn on `jobs` worker
+    processes, each of which loads the cube once; pages drawn in this
+    process use the caller's matplotlib backend. Returns the written paths
+    in order.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    _load(cube_path)
+    sweep, cube = _cube
+    n = cube[next(iter(sweep.params))].size
+    if frames:
+        groups, columns = [[i] for i in range(n)], 1
+    else:
+        groups = [list(range(lo, min(lo + per_page, n))) for lo in range(0, n, per_page)]
+        columns = min(columns, n)
+    limits = _limits(sweep, cube, range(n))
+    stem = os.path.splitext(os.path.basename(cube_path))[0]
+    kind = 'frame' if frames else 'page'
+    paths = [os.path.join(out_dir, f"{stem}_{kind}{k:03d}.png") for k in range(len(groups))]
+    os.makedirs(out_dir, exist_ok=True)
+
+    tasks = [(group, path, limits, dpi, columns) for group, path in zip(groups, paths)]
+    if jobs <= 1 or len(tasks) <= 1:
+        return [_render_page(*task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(tasks)), initializer=_load_worker,
+                             initargs=(cube_path,)) as pool:
+        return list(pool.map(_render_page, *zip(*tasks)))
+
+
+def main(argv=None):
+    """Command line: compute a sweep's data cube and render it."""
+    parser = argparse.ArgumentParser(description="Sweep a figure over parameter ranges.")
+    parser.add_argument('sweep', nargs='?', choices=list(SWEEPS_BY_KEY), help="sweep to run")
+    parser.add_argument('ranges', nargs='*', type=_range_arg, metavar='NAME=RANGE',
+                        help="parameter values: start:stop:num, a,b,c or a number")
+    parser.add_argument('--list', action='store_true', help="list sweeps and their parameters")
+    parser.add_argument('--cube', help="data cube path (default: <output>/<sweep>.npz)")
+    parser.add_argument('--from-cube', action='store_true',
+                        help="render an existing cube without recomputing it")
+    parser.add_argument('-o', '--output', default=OUTPUT_DIR, help="output directory")
+    parser.add_argument('--frames', action='store_true', help="one image per configuration")
+    parser.add_argument('--per-page', type=int, default=16, help="panels per small-multiples page")
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help="render processes")
+    args = parser.parse_args(argv)
+
+    if args.list or args.sweep is None:
+        for sweep in SWEEPS:
+            params = ', '.join(f"{name}={np.min(v):g}..{np.max(v):g} ({np.size(v)})"
+                               for name, v in sweep.params.items())
+            print(f"{sweep.key:<16} {sweep.title:<40} {params}")
+        return 0
+
+    sweep = SWEEPS_BY_KEY[args.sweep]
+    cube_path = args.cube or os.path.join(args.output, f"{sweep.key}.npz")
+    if not args.from_cube:
+        try:
+            start = time.perf_counter()
+            cube = compute(sweep, **dict(args.ranges))
+            elapsed = time.perf_counter() - start
+        except ValueError as e:
+            parser.error(str(e))
+        save_cube(cube_path, sweep, cube)
+        n = cube[next(iter(sweep.params))].size
+        print(f"✓ Computed {n} configurations in {elapsed:.2f}s -> {cube_path} "
+              f"({os.path.getsize(cube_path) / 1024:.0f} KB)")
+
+    if args.from_cube:
+        try:
+            load_cube(cube_path)
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile) as e:
+            parser.error(f"cannot read cube {cube_path}: {e}")
+
+    import matplotlib
+    matplotlib.use('Agg')
+    start = time.perf_counter()
+    paths = render(cube_path, args.output, args.frames, args.per_page, dpi=args.dpi, jobs=args.jobs)
+    print(f"✓ Rendered {len(paths)} {'frames' if args.frames else 'pages'} "
+          f"in {time.perf_counter() - start:.2f}s -> {args.output}/")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,449 @@
+"""
+Curvature Tensors - Metric to Einstein on Coordinate Grids
+==========================================================
+Evaluate the chain g -> Christoffel -> Riemann -> Ricci -> R -> Einstein numerically.
+
+A metric is a function of the coordinates returning its non-zero components
+g_{mu nu} (mu <= nu) as a dict, written with ordinary NumPy operations:
+
+    def schwarzschild_metric(t, r, theta, phi, M=1.0):
+        f = 1 - 2 * M / r
+        return {(0, 0): -f, (1, 1): 1 / f, (2, 2): r**2, (3, 3): (r * np.sin(theta))**2}
+
+The coordinates are passed in as `Jet`s, which carry exact first and second
+derivatives through every NumPy ufunc, so derivatives of g are exact (no
+finite differences) and evaluated on the whole grid at once. Components
+that are structurally zero are never stored or multiplied.
+
+`Curvature` computes each tensor lazily and memoizes it, keeping only the
+independent components: Christoffel symbols symmetric in their lower pair
+(40 in 4D) and the covariant Riemann tensor over ordered index pairs,
+minus the first Bianchi identity (20 in 4D). Ricci, the scalar, Einstein
+and the Kretschmann scalar reuse whatever has already been computed.
+"""
+
+from functools import cached_property
+from itertools import combinations, combinations_with_replacement
+
+import numpy as np
+
+import metrics
+
+
+def _zero(x):
+    """True for the structural zero (a plain Python 0)."""
+    return isinstance(x, (int, float)) and x == 0
+
+
+def _add(a, b):
+    if _zero(a):
+        return b
+    if _zero(b):
+        return a
+    return a + b
+
+
+def _mul(a, b):
+    if _zero(a) or _zero(b):
+        return 0
+    return a * b
+
+
+def _sum(terms):
+    total = 0
+    for term in terms:
+        total = _add(total, term)
+    return total
+
+
+class Jet:
+    """A value together with its exact gradient and Hessian in n coordinates.
+
+    `d[i]` is the first derivative along coordinate i and `h[i, j]` (i <= j)
+    the second derivative; absent or zero entries are structural zeros.
+    """
+
+    __array_priority__ = 1000
+
+    def __init__(self, v, d, h):
+        self.v = v
+        self.d = d
+        self.h = h
+
+    @property
+    def n(self):
+        return len(self.d)
+
+    def hess(self, i, j):
+        return self.h.get((i, j) if i <= j else (j, i), 0)
+
+    @staticmethod
+    def const(value, n):
+        return Jet(value, [0] * n, {})
+
+    def _lift(self, other):
+        return other if isinstance(other, Jet) else Jet.const(other, self.n)
+
+    def _chain(self, f0, f1, f2):
+        """Apply a scalar function with value f0 and derivatives f1, f2."""
+        d = [_mul(f1, di) for di in self.d]
+        h = {}
+        for i, j in combinations_with_replacement(range(self.n), 2):
+            hij = _add(_mul(f1, self.hess(i, j)), _mul(f2, _mul(self.d[i], self.d[j])))
+            if not _zero(hij):
+                h[i, j] = hij
+        return Jet(f0, d, h)
+
+    def __add__(self, other):
+        other = self._lift(other)
+        d = [_add(a, b) for a, b in zip(self.d, other.d)]
+        h = {k: _add(self.h.get(k, 0), other.h.get(k, 0)) for k in self.h.keys() | other.h.keys()}
+        return Jet(self.v + other.v, d, h)
+
+    __radd__ = __add__
+
+    def __neg__(self):
+        return Jet(-self.v, [_mul(-1, a) for a in self.d], {k: -a for k, a in self.h.items()})
+
+    def __pos__(self):
+        return self
+
+    def __sub__(self, other):
+        return self + (-self._lift(other))
+
+    def __rsub__(self, other):
+        return self._lift(other) - self
+
+    def __mul__(self, other):
+        if not isinstance(other, Jet):
+            return Jet(self.v * other, [_mul(a, other) for a in self.d],
+                       {k: a * other for k, a in self.h.items()})
+        d = [_add(_mul(self.v, b), _mul(other.v, a)) for a, b in zip(self.d, other.d)]
+        h = {}
+        for i, j in combinations_with_replacement(range(self.n), 2):
+            hij = _sum([_mul(self.v, other.hess(i, j)), _mul(other.v, self.hess(i, j)),
+                        _mul(self.d[i], other.d[j]), _mul(self.d[j], other.d[i])])
+            if not _zero(hij):
+                h[i, j] = hij
+        return Jet(self.v * other.v, d, h)
+
+    __rmul__ = __mul__
+
+    def reciprocal(self):
+        inv = 1 / self.v
+        return self._chain(inv, -inv * inv, 2 * inv * inv * inv)
+
+    def __truediv__(self, other):
+        if not isinstance(other, Jet):
+            return self * (1 / other)
+        return self * other.reciprocal()
+
+    def __rtruediv__(self, other):
+        return self.reciprocal() * other
+
+    def __pow__(self, p):
+        if isinstance(p, Jet):
+            return p.__rpow__(self)
+        if p == 2:
+            return self * self
+        v = self.v
+        return self._chain(v**p, p * v**(p - 1), p * (p - 1) * v**(p - 2))
+
+    def __rpow__(self, base):
+        """base ** self = exp(self * log(base)), for a constant or Jet base."""
+        return _exp(self * np.log(base))
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method != '__call__' or kwargs:
+            return NotImplemented
+        if ufunc in _BINARY:
+            a, b = inputs
+            return _BINARY[ufunc](a, b) if isinstance(a, Jet) else _BINARY_R[ufunc](b, a)
+        if ufunc in _UNARY:
+            return _UNARY[ufunc](inputs[0])
+        return NotImplemented
+
+
+def _sin(x):
+    s, c = np.sin(x.v), np.cos(x.v)
+    return x._chain(s, c, -s)
+
+
+def _cos(x):
+    s, c = np.sin(x.v), np.cos(x.v)
+    return x._chain(c, -s, -c)
+
+
+def _exp(x):
+    e = np.exp(x.v)
+    return x._chain(e, e, e)
+
+
+def _log(x):
+    inv = 1 / x.v
+    return x._chain(np.log(x.v), inv, -inv * inv)
+
+
+_BINARY = {np.add: Jet.__add__, np.subtract: Jet.__sub__, np.multiply: Jet.__mul__,
+           np.true_divide: Jet.__truediv__, np.power: Jet.__pow__}
+_BINARY_R = {np.add: Jet.__radd__, np.subtract: Jet.__rsub__, np.multiply: Jet.__rmul__,
+             np.true_divide: Jet.__rtruediv__, np.power: Jet.__rpow__}
+_UNARY = {np.negative: Jet.__neg__, np.positive: Jet.__pos__, np.reciprocal: Jet.reciprocal,
+          np.square: lambda x: x * x, np.sqrt: lambda x: x**0.5,
+          np.sin: _sin, np.cos: _cos, np.tan: lambda x: _sin(x) / _cos(x),
+          np.exp: _exp, np.log: _log}
+
+
+def coordinates(*grids):
+    """Coordinate jets for broadcastable coordinate arrays (or scalars)."""
+    n = len(grids)
+    return [Jet(np.asarray(g, dtype=float), [1.0 if j == i else 0 for j in range(n)], {})
+            for i, g in enumerate(grids)]
+
+
+class Curvature:
+    """Memoized curvature chain of `metric` evaluated on coordinate `grids`.
+
+    Every tensor is a dict from index tuples to arrays of the grid shape
+    that holds only its independent, structurally non-zero components:
+
+    christoffel  -- Gamma^l_{m n} for m <= n
+    riemann      -- R_{abcd} for pairs a < b, c < d, (a, b) <= (c, d)
+    ricci, einstein -- (m, n) with m <= n
+    """
+
+    def __init__(self, metric, *grids, **params):
+        self.dim = len(grids)
+        self._coords = coordinates(*grids)
+        self._metric = metric
+        self._params = params
+        self.shape = np.broadcast_shapes(*(np.shape(g) for g in grids))
+
+    @cached_property
+    def _g(self):
+        """Metric components as jets, including both (m, n) and (n, m)."""
+        comps = self._metric(*self._coords, **self._params)
+        g = {}
+        for (m, n), value in comps.items():
+            if not isinstance(value, Jet):
+                value = Jet.const(np.asarray(value, dtype=float), self.dim)
+            g[m, n] = g[n, m] = value
+        return g
+
+    def _gd(self, m, n, i):
+        jet = self._g.get((m, n))
+        return 0 if jet is None else jet.d[i]
+
+    def _gh(self, m, n, i, j):
+        jet = self._g.get((m, n))
+        return 0 if jet is None else jet.hess(i, j)
+
+    @cached_property
+    def metric(self):
+        """g_{mn} values for m <= n."""
+        return {(m, n): np.broadcast_to(j.v, self.shape) for (m, n), j in self._g.items() if m <= n}
+
+    @cached_property
+    def inverse_metric(self):
+        """g^{mn} values for m <= n, inverted block by block.
+
+        The coordinates split into blocks that g couples (t and phi for
+        Kerr); 1x1 and 2x2 blocks are inverted in closed form, larger ones
+        with np.linalg.inv. Where a block is singular, as on the polar axis
+        of Boyer-Lindquist coordinates (g_tphi = g_phiphi = 0), its entries
+        are NaN rather than an error.
+        """
+        inverse = {}
+        for block in self._blocks():
+            g = [[self._g[m, n].v if (m, n) in self._g else 0.0 for n in block] for m in block]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                if len(block) == 1:
+                    det = g[0][0]
+                    entries = {(0, 0): 1 / det}
+                elif len(block) == 2:
+                    (g00, g01), (_, g11) = g
+                    det = g00 * g11 - g01 * g01
+                    entries = {(0, 0): g11 / det, (0, 1): -g01 / det, (1, 1): g00 / det}
+                else:
+                    dense = np.zeros(self.shape + (len(block),) * 2)
+                    for i, j in np.ndindex(*dense.shape[-2:]):
+                        dense[..., i, j] = g[i][j]
+                    det = np.linalg.det(dense)
+                    singular = (det == 0)[..., None, None]
+                    inv = np.linalg.inv(np.where(singular, np.eye(len(block)), dense))
+                    entries = {(i, j): inv[..., i, j]
+                               for i, j in combinations_with_replacement(range(len(block)), 2)}
+            for (i, j), value in entries.items():
+                value = np.where(det != 0, value, np.nan)
+                if np.any(value):
+                    inverse[block[i], block[j]] = value
+        return inverse
+
+    def _blocks(self):
+        """Sorted groups of coordinates that the off-diagonal metric components couple."""
+        group = list(range(self.dim))
+        for m, n in self._g:
+            gm, gn = group[m], group[n]
+            if gm != gn:
+                group = [gm if g == gn else g for g in group]
+        return [[i for i in range(self.dim) if group[i] == g] for g in sorted(set(group))]
+
+    def _ginv(self, m, n):
+        return self.inverse_metric.get((m, n) if m <= n else (n, m), 0)
+
+    @cached_property
+    def christoffel_first(self):
+        """Gamma_{a m n} = (d_n g_am + d_m g_an - d_a g_mn) / 2 for m <= n."""
+        gamma = {}
+        for a in range(self.dim):
+            for m, n in combinations_with_replacement(range(self.dim), 2):
+                value = _sum([self._gd(a, m, n), self._gd(a, n, m), _mul(-1, self._gd(m, n, a))])
+                if not _zero(value):
+                    gamma[a, m, n] = 0.5 * value
+        return gamma
+
+    def _gamma1(self, a, m, n):
+        return self.christoffel_first.get((a, m, n) if m <= n else (a, n, m), 0)
+
+    @cached_property
+    def christoffel(self):
+        """Gamma^l_{m n} = g^{la} Gamma_{a m n} for m <= n."""
+        gamma = {}
+        for l in range(self.dim):
+            for m, n in combinations_with_replacement(range(self.dim), 2):
+                value = _sum(_mul(self._ginv(l, a), self._gamma1(a, m, n)) for a in range(self.dim))
+                if not _zero(value):
+                    gamma[l, m, n] = value
+        return gamma
+
+    def _gamma2(self, l, m, n):
+        return self.christoffel.get((l, m, n) if m <= n else (l, n, m), 0)
+
+    def _riemann_direct(self, r, s, m, n):
+        """R_{rsmn} from second metric derivatives and Christoffel products."""
+        second = _sum([self._gh(r, n, s, m), self._gh(s, m, r, n),
+                       _mul(-1, self._gh(r, m, s, n)), _mul(-1, self._gh(s, n, r, m))])
+        quad = _sum(_add(_mul(self._gamma2(a, s, m), self._gamma1(a, r, n)),
+                         _mul(-1, _mul(self._gamma2(a, s, n), self._gamma1(a, r, m))))
+                    for a in range(self.dim))
+        return _add(_mul(0.5, second), quad)
+
+    @cached_property
+    def riemann(self):
+        """Independent covariant Riemann components R_{abcd}.
+
+        Components over ordered pairs (a < b) <= (c < d); for every
+        a < b < c < d the (ad, bc) component follows from the first Bianchi
+        identity R_{adbc} = R_{acbd} - R_{abcd} instead of being computed.
+        """
+        pairs = list(combinations(range(self.dim), 2))
+        bianchi = {((a, d), (b, c)) for a, b, c, d in combinations(range(self.dim), 4)}
+        riemann = {}
+        for p, q in combinations_with_replacement(pairs, 2):
+            if (p, q) in bianchi:
+                continue
+            value = self._riemann_direct(*p, *q)
+            if not _zero(value):
+                riemann[p + q] = value
+        for (a, d), (b, c) in bianchi:
+            value = _add(riemann.get((a, c, b, d), 0), _mul(-1, riemann.get((a, b, c, d), 0)))
+            if not _zero(value):
+                riemann[a, d, b, c] = value
+        return riemann
+
+    def riemann_component(self, a, b, c, d):
+        """Any R_{abcd}, recovered from the independent components by symmetry."""
+        if a == b or c == d:
+            return 0
+        sign = 1
+        if a > b:
+            a, b, sign = b, a, -sign
+        if c > d:
+            c, d, sign = d, c, -sign
+        if (a, b) > (c, d):
+            a, b, c, d = c, d, a, b
+        value = self.riemann.get((a, b, c, d), 0)
+        return value if sign > 0 else _mul(-1, value)
+
+    @cached_property
+    def ricci(self):
+        """R_{mn} = g^{ab} R_{a m b n} for m <= n."""
+        ricci = {}
+        for m, n in combinations_with_replacement(range(self.dim), 2):
+            value = _sum(_mul(self._ginv(a, b), self.riemann_component(a, m, b, n))
+                         for a in range(self.dim) for b in range(self.dim))
+            if not _zero(value):
+                ricci[m, n] = value
+        return ricci
+
+    @cached_property
+    def ricci_scalar(self):
+        """R = g^{mn} R_{mn}."""
+        value = _sum(_mul(self._ginv(m, n), value) * (1 if m == n else 2)
+                     for (m, n), value in self.ricci.items())
+        return np.broadcast_to(value, self.shape) if not _zero(value) else np.zeros(self.shape)
+
+    @cached_property
+    def einstein(self):
+        """G_{mn} = R_{mn} - g_{mn} R / 2 for m <= n."""
+        einstein = {}
+        for m, n in combinations_with_replacement(range(self.dim), 2):
+            g = self._g.get((m, n))
+            value = _add(self.ricci.get((m, n), 0),
+                         0 if g is None else -0.5 * g.v * self.ricci_scalar)
+            if not _zero(value):
+                einstein[m, n] = value
+        return einstein
+
+    @cached_property
+    def kretschmann(self):
+        """K = R_{abcd} R^{abcd}.
+
+        Computed in bivector form: with pair indices P = (a < b) and
+        G^{PQ} = g^{ac} g^{bd} - g^{ad} g^{bc}, K = 4 tr((G R)^2), so no
+        rank-4 array is ever built.
+        """
+        pairs = list(combinations(range(self.dim), 2))
+        G = {(p, q): _add(_mul(self._ginv(p[0], q[0]), self._ginv(p[1], q[1])),
+                          _mul(-1, _mul(self._ginv(p[0], q[1]), self._ginv(p[1], q[0]))))
+             for p in pairs for q in pairs}
+        mixed = {(p, q): _sum(_mul(G[p, s], self.riemann_component(*s, *q)) for s in pairs)
+                 for p in pairs for q in pairs}
+        total = _sum(_mul(mixed[p, q], mixed[q, p]) for p in pairs for q in pairs)
+        return np.broadcast_to(4 * total, self.shape) if not _zero(total) else np.zeros(self.shape)
+
+    def full(self, name):
+        """Expand a memoized tensor into a dense array of shape (dim,) * rank + grid."""
+        if name == 'riemann':
+            out = np.zeros((self.dim,) * 4 + self.shape)
+            for idx in np.ndindex(*(self.dim,) * 4):
+                out[idx] = self.riemann_component(*idx)
+            return out
+        if name == 'christoffel':
+            out = np.zeros((self.dim,) * 3 + self.shape)
+            for (l, m, n), value in self.christoffel.items():
+                out[l, m, n] = out[l, n, m] = value
+            return out
+        tensor = {'metric': self.metric, 'inverse_metric': self.inverse_metric,
+                  'ricci': self.ricci, 'einstein': self.einstein}[name]
+        out = np.zeros((self.dim,) * 2 + self.shape)
+        for (m, n), value in tensor.items():
+            out[m, n] = out[n, m] = value
+        return out
+
+
+def minkowski_metric(t, x, y, z):
+    """Flat spacetime, diag(-1, 1, 1, 1)."""
+    return {(0, 0): -1.0, (1, 1): 1.0, (2, 2): 1.0, (3, 3): 1.0}
+
+
+def schwarzschild_metric(t, r, theta, phi, M=1.0):
+    """Schwarzschild metric in Schwarzschild coordinates (G = c = 1)."""
+    f = 1 - 2 * M / r
+    return {(0, 0): -f, (1, 1): 1 / f, (2, 2): r**2, (3, 3): (r * np.sin(theta))**2}
+
+
+def kerr_metric(t, r, theta, phi, M=1.0, a=0.0):
+    """Kerr metric in Boyer-Lindquist coordinates, spin parameter a = J/M
+    (`metrics.kerr_newman_metric` with Q = 0)."""
+    return metrics.kerr_newman_metric(t, r, theta, phi, M=M, a=a)
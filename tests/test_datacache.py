@@ -0,0 +1,37 @@
+import os
+
+import numpy as np
+import pytest
+
+import datacache
+import visualizations
+
+
+@pytest.mark.parametrize('keep', [0, 100, -10])
+def test_corrupt_entry_is_a_miss_and_removed(tmp_path, keep):
+    cache = datacache.DataCache(str(tmp_path))
+    cache.put('key', {'a': np.arange(100.0)})
+    path = tmp_path / 'key.npz'
+    path.write_bytes(path.read_bytes()[:keep])
+    assert cache.get('key') is None
+    assert not path.exists()
+    assert cache.misses == 1
+
+
+def _producer(n=4):
+    _producer.calls += 1
+    return {'x': np.arange(n, dtype=float)}
+
+
+def test_figure_data_recomputes_after_truncated_entry(tmp_path, monkeypatch):
+    _producer.calls = 0
+    monkeypatch.setattr(visualizations, '_data_cache', datacache.DataCache(str(tmp_path)))
+    first = visualizations.figure_data(_producer, n=4)
+    (entry,) = tmp_path.iterdir()
+    with open(entry, 'r+b') as f:
+        f.truncate(os.path.getsize(entry) // 2)
+    again = visualizations.figure_data(_producer, n=4)
+    np.testing.assert_array_equal(again['x'], first['x'])
+    assert _producer.calls == 2
+    visualizations.figure_data(_producer, n=4)
+    assert _producer.calls == 2  # the rewritten entry is a hit
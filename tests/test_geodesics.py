@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+import geodesics
+
+
+def test_precession_approaches_weak_field_limit():
+    e, M = 0.3, 1.0
+    a = np.array([100.0, 1000.0, 10000.0])
+    p = a * (1 - e**2)
+    numeric = geodesics.periapsis_precession(a, e, M)
+    rel_err = numeric / geodesics.analytic_precession(a, e, M) - 1
+    # The next order in M/p: rel_err = (18 + e^2) / 4 * M / p + O((M/p)^2)
+    scaled = rel_err * p / ((18 + e**2) / 4 * M)
+    assert np.all(np.abs(scaled - 1) < 10 * M / p)
+    assert np.all(np.diff(np.abs(rel_err)) < 0)
+
+
+@pytest.mark.parametrize('rtol', [1e-8, 1e-10, 1e-12])
+def test_conserved_quantity_drift(rtol):
+    rng = np.random.default_rng(1)
+    # stable orbits: p = a (1 - e^2) > (6 + 2e) M
+    u0, w0, alpha = geodesics.bound_orbit(rng.uniform(20, 100, 200), rng.uniform(0, 0.5, 200))
+    sol = geodesics.integrate(u0, w0, alpha, phi_end=4 * np.pi, rtol=rtol, atol=rtol / 100)
+    assert np.all(sol.status == geodesics.FINISHED)
+    assert sol.drift.max() < 10 * rtol
+    c0 = geodesics.conserved(u0, w0, alpha)
+    np.testing.assert_allclose(geodesics.conserved(sol.u_stop, sol.w_stop, alpha), c0, rtol=10 * rtol)
+
+
+def test_termination_status():
+    M = 1.0
+    b = np.array([4.0, 5.0, 5.3, 6.0, 20.0])  # capture below 3 sqrt(3) M = 5.196 M
+    u0, w0, alpha = geodesics.null_ray(b, 1e3, M)
+    phi = np.linspace(0, 10 * np.pi, 400)
+    sol = geodesics.integrate(u0, w0, alpha, M, phi_end=10 * np.pi, phi_eval=phi)
+    captured = b < 3 * np.sqrt(3) * M
+    np.testing.assert_array_equal(sol.status, np.where(captured, geodesics.CAPTURED, geodesics.ESCAPED))
+    np.testing.assert_allclose(sol.u_stop[captured], 1 / (2 * M))
+    np.testing.assert_allclose(sol.u_stop[~captured], 0.0, atol=1e-15)
+    # No output past the point where a particle stopped
+    after = phi[:, None] > sol.phi_stop[None, :]
+    assert np.isnan(sol.u[after]).all() and np.isfinite(sol.u[~after]).all()
+
+
+def test_bound_orbit_rejects_unstable():
+    with pytest.raises(ValueError):
+        geodesics.bound_orbit(4.0, 0.5)
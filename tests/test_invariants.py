@@ -0,0 +1,36 @@
+import os
+import warnings
+from functools import partial
+
+import numpy as np
+import pytest
+
+import invariants
+
+
+def test_chain_matches_closed_form_on_odd_grid(tmp_path):
+    # An odd symmetric grid contains the polar axis (x = y = 0)
+    path = str(tmp_path / 'k.npy')
+    field = partial(invariants.FIELDS['kretschmann-chain'], M=1.0, a=0.9)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        volume = invariants.evaluate_volume(field, path, (9, 9, 9), [(-8, 8)] * 3, block=4, jobs=1)
+    x = np.linspace(-8, 8, 9)
+    X, Y, Z = np.meshgrid(x, x, x, indexing='ij')
+    axis = (X == 0) & (Y == 0)
+    assert np.isnan(volume[axis]).all()
+    expected = invariants.kerr_kretschmann(X[~axis], Y[~axis], Z[~axis], 1.0, 0.9)
+    np.testing.assert_allclose(volume[~axis], expected, rtol=1e-5)
+    assert sorted(os.listdir(tmp_path)) == ['k.npy', 'k.npy.json']
+
+
+def test_failed_volume_leaves_nothing(tmp_path):
+    def field(x, y, z):
+        if np.any(x > 0):
+            raise RuntimeError("block failed")
+        return x + y + z
+
+    with pytest.raises(RuntimeError):
+        invariants.evaluate_volume(field, str(tmp_path / 'v.npy'), (8, 8, 8), [(-1, 1)] * 3,
+                                   block=4, jobs=1)
+    assert os.listdir(tmp_path) == []
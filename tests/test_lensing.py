@@ -0,0 +1,29 @@
+import os
+
+import numpy as np
+
+import lensing
+
+
+def test_deflection_table_cache_recovers_from_partial_file(tmp_path):
+    log_db, alpha = lensing.deflection_table(n=512, cache_dir=tmp_path)
+    (path,) = tmp_path.iterdir()
+    with open(path, 'r+b') as f:
+        f.truncate(100)
+    _, again = lensing.deflection_table(n=512, cache_dir=tmp_path)
+    np.testing.assert_array_equal(again, alpha)
+    assert os.listdir(tmp_path) == [path.name]
+
+
+def test_unwritable_cache_dir_computes_without_caching(tmp_path):
+    blocker = tmp_path / 'not-a-directory'
+    blocker.write_text('')
+    _, alpha = lensing.deflection_table(n=512, cache_dir=str(blocker / 'cache'))
+    _, expected = lensing.deflection_table(n=512, cache_dir=None)
+    np.testing.assert_array_equal(alpha, expected)
+
+
+def test_cache_dir_is_outside_the_package():
+    package = os.path.dirname(os.path.abspath(lensing.__file__))
+    assert os.path.isabs(lensing.CACHE_DIR)
+    assert os.path.commonpath([package, lensing.CACHE_DIR]) != package
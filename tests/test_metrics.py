@@ -0,0 +1,25 @@
+import warnings
+
+import numpy as np
+import pytest
+
+import metrics
+
+
+def test_isco_rejects_kerr_newman():
+    with pytest.raises(ValueError, match="Kerr-Newman"):
+        metrics.Metric(1.0, a=0.5, Q=0.3).isco()
+
+
+def test_isco_known_values():
+    assert metrics.Schwarzschild(1.0).isco() == pytest.approx(6.0)
+    assert metrics.ReissnerNordstrom(1.0, Q=1.0).isco() == pytest.approx(4.0)
+
+
+def test_horizon_evaluation_is_silent():
+    schwarzschild = metrics.Schwarzschild(1.0)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        g = schwarzschild.components(np.array([2.0]), np.pi / 2)
+        assert np.isinf(g[(1, 1)][0])
+        assert schwarzschild.time_dilation(np.array([2.0]), np.pi / 2)[0] == 0.0
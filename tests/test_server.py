@@ -0,0 +1,73 @@
+import json
+import os
+import signal
+import time
+
+import pytest
+
+import server
+
+
+@pytest.fixture(scope='module')
+def app():
+    app = server.FigureServer(workers=1, cache_bytes=2**20)
+    yield app
+    app.close()
+
+
+def get(app, path, query=''):
+    response = {}
+    body = app({'PATH_INFO': path, 'QUERY_STRING': query, 'REQUEST_METHOD': 'GET'},
+               lambda status, headers: response.update(status=status, headers=dict(headers)))
+    return response['status'], response['headers'], b''.join(body)
+
+
+def test_routes(app):
+    status, _, body = get(app, '/figures')
+    assert status == '200 OK'
+    assert [f['key'] for f in json.loads(body)['figures']] == list(server.FIGURES)
+    assert get(app, '/figures/no_such_figure.png')[0] == '404 Not Found'
+    assert get(app, '/nowhere')[0] == '404 Not Found'
+    assert get(app, '/figures/tensor_indices.bmp')[0] == '400 Bad Request'
+
+
+@pytest.mark.parametrize('query', ['dpi=5000', 'dpi=abc', 'width=99999', 'profile=poster',
+                                   'profile=print&dpi=1200'])
+def test_rejects_bad_or_oversized_requests(app, query):
+    status, _, body = get(app, '/figures/spacetime_curvature.png', query)
+    assert status == '400 Bad Request'
+    assert 'error' in json.loads(body)
+
+
+def test_render_is_cached_and_counted(app):
+    before = json.loads(get(app, '/stats')[2])['cache']
+    status, headers, body = get(app, '/figures/tensor_indices.png', 'dpi=30')
+    assert status == '200 OK' and body.startswith(b'\x89PNG') and headers['X-Cache'] == 'MISS'
+    assert get(app, '/figures/tensor_indices.png', 'dpi=30')[1]['X-Cache'] == 'HIT'
+    after = json.loads(get(app, '/stats')[2])['cache']
+    assert after['misses'] == before['misses'] + 1
+    assert after['hits'] == before['hits'] + 1
+    assert after['entries'] >= 1 and after['bytes'] <= after['max_bytes']
+
+
+def test_lru_evicts_least_recently_used():
+    cache = server.LRUCache(max_bytes=10)
+    cache.put('a', 'A', 4)
+    cache.put('b', 'B', 4)
+    assert cache.get('a') == 'A'  # 'b' is now least recently used
+    cache.put('c', 'C', 4)
+    assert cache.get('b') is None and cache.get('a') == 'A' and cache.get('c') == 'C'
+    cache.put('huge', 'H', 11)  # larger than the bound: not kept
+    assert cache.get('huge') is None
+    assert cache.stats() == {'entries': 2, 'bytes': 8, 'max_bytes': 10, 'hits': 3, 'misses': 2,
+                             'evictions': 1}
+
+
+def test_pool_is_replaced_after_a_worker_dies(app):
+    restarts = app.restarts
+    for pid in list(app.pool._processes):
+        os.kill(pid, signal.SIGKILL)
+    time.sleep(0.5)
+    status, _, body = get(app, '/figures/metric_tensor.png', 'dpi=20')
+    assert status == '200 OK' and body.startswith(b'\x89PNG')
+    assert json.loads(get(app, '/stats')[2])['restarts'] == restarts + 1
@@ -0,0 +1,17 @@
+import json
+import os
+import subprocess
+import sys
+
+import benchmarks
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_visualizations_import_is_light():
+    script = ("import json, sys\n"
+              "import visualizations\n"
+              f"print(json.dumps([m for m in {benchmarks.HEAVY_MODULES!r} if m in sys.modules]))\n")
+    out = subprocess.run([sys.executable, '-c', script], cwd=PROJECT_DIR, check=True,
+                         capture_output=True, text=True).stdout
+    assert json.loads(out) == []
@@ -0,0 +1,44 @@
+import matplotlib
+import numpy as np
+import pytest
+
+import sweeps
+
+
+@pytest.mark.parametrize('spec', ['M=abc', 'M', 'M=', '=1', 'M=1:2'])
+def test_malformed_range_is_a_usage_error(spec, capsys):
+    with pytest.raises(SystemExit) as excinfo:
+        sweeps.main(['time_dilation', spec, '-o', 'unused'])
+    assert excinfo.value.code == 2
+    assert 'NAME=RANGE' in capsys.readouterr().err
+
+
+def test_parse_range_forms():
+    np.testing.assert_allclose(sweeps.parse_range('0:1:3'), [0, 0.5, 1])
+    np.testing.assert_allclose(sweeps.parse_range('1,2.5'), [1, 2.5])
+    np.testing.assert_allclose(sweeps.parse_range('4'), [4])
+
+
+@pytest.mark.parametrize('contents', [None, b'', b'not a cube'])
+def test_unreadable_cube_is_a_usage_error(contents, tmp_path, capsys):
+    path = tmp_path / 'cube.npz'
+    if contents is not None:
+        path.write_bytes(contents)
+    with pytest.raises(SystemExit) as excinfo:
+        sweeps.main(['time_dilation', '--from-cube', '--cube', str(path), '-o', str(tmp_path)])
+    assert excinfo.value.code == 2
+    assert 'cannot read cube' in capsys.readouterr().err
+
+
+def test_serial_render_keeps_callers_backend(tmp_path):
+    sweep = sweeps.SWEEPS_BY_KEY['time_dilation']
+    path = str(tmp_path / 'cube.npz')
+    sweeps.save_cube(path, sweep, sweeps.compute(sweep, M=np.array([0.5, 1.0])))
+    backend = matplotlib.get_backend()
+    matplotlib.use('pdf')
+    try:
+        paths = sweeps.render(path, str(tmp_path), jobs=1)
+        assert matplotlib.get_backend() == 'pdf'
+    finally:
+        matplotlib.use(backend)
+    assert len(paths) == 1
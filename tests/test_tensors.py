@@ -0,0 +1,100 @@
+from itertools import product
+
+import numpy as np
+import pytest
+
+import invariants
+import tensors
+
+R = np.linspace(2.5, 20.0, 7)[:, None]
+THETA = np.linspace(0.2, np.pi - 0.2, 5)[None, :]
+
+
+def _kerr(**params):
+    return tensors.Curvature(tensors.kerr_metric, 0.0, R, THETA, 0.0, **params)
+
+
+def test_jet_derivatives():
+    x, y = tensors.coordinates(np.array([0.5, 2.0]), 1.5)
+    f = np.sin(x) * y**3 + np.exp(x / y) + np.power(2.0, x) + x**y
+    xv, yv = x.v, y.v
+    np.testing.assert_allclose(f.d[0], np.cos(xv) * yv**3 + np.exp(xv / yv) / yv + np.log(2) * 2**xv
+                               + yv * xv**(yv - 1))
+    np.testing.assert_allclose(f.d[1], 3 * np.sin(xv) * yv**2 - xv / yv**2 * np.exp(xv / yv)
+                               + np.log(xv) * xv**yv)
+    np.testing.assert_allclose(f.hess(0, 0), -np.sin(xv) * yv**3 + np.exp(xv / yv) / yv**2
+                               + np.log(2)**2 * 2**xv + yv * (yv - 1) * xv**(yv - 2))
+
+
+def test_scalar_power_of_jet_matches_builtin_pow():
+    x, = tensors.coordinates(np.array([1.0, 2.0]))
+    via_ufunc, via_operator = np.power(3.0, x), 3.0**x
+    np.testing.assert_allclose(via_ufunc.v, [3.0, 9.0])
+    np.testing.assert_allclose(via_ufunc.d[0], via_operator.d[0])
+    np.testing.assert_allclose(via_ufunc.hess(0, 0), np.log(3.0)**2 * via_ufunc.v)
+
+
+def test_schwarzschild_kretschmann():
+    M = 1.5
+    curvature = tensors.Curvature(tensors.schwarzschild_metric, 0.0, R + 1, THETA, 0.0, M=M)
+    expected = np.broadcast_to(48 * M**2 / (R + 1)**6, curvature.shape)
+    np.testing.assert_allclose(curvature.kretschmann, expected, rtol=1e-10)
+
+
+@pytest.mark.parametrize('a', [0.5, 0.9])
+def test_kerr_kretschmann_and_vacuum(a):
+    curvature = _kerr(M=1.0, a=a)
+    # Cartesian points with these Boyer-Lindquist coordinates (phi = 0)
+    x, z = np.hypot(R, a) * np.sin(THETA), R * np.cos(THETA)
+    np.testing.assert_allclose(curvature.kretschmann, invariants.kerr_kretschmann(x, 0.0, z, 1.0, a),
+                               rtol=1e-8)
+    scale = np.max(np.abs(curvature.kretschmann))**0.5
+    for value in curvature.ricci.values():
+        assert np.max(np.abs(value)) < 1e-10 * scale
+
+
+def test_riemann_symmetries():
+    curvature = _kerr(M=1.0, a=0.7)
+    for a, b, c, d in product(range(4), repeat=4):
+        direct = curvature._riemann_direct(a, b, c, d)
+        stored = curvature.riemann_component(a, b, c, d)
+        np.testing.assert_allclose(np.broadcast_to(direct, curvature.shape),
+                                   np.broadcast_to(stored, curvature.shape), atol=1e-12)
+    full = curvature.full('riemann')
+    np.testing.assert_allclose(full, -full.transpose(1, 0, 2, 3, 4, 5), atol=1e-12)
+    np.testing.assert_allclose(full, -full.transpose(0, 1, 3, 2, 4, 5), atol=1e-12)
+    np.testing.assert_allclose(full, full.transpose(2, 3, 0, 1, 4, 5), atol=1e-12)
+    bianchi = full + full.transpose(0, 2, 3, 1, 4, 5) + full.transpose(0, 3, 1, 2, 4, 5)
+    assert np.max(np.abs(bianchi)) < 1e-12
+
+
+def test_christoffel_matches_finite_differences():
+    params = {'M': 1.0, 'a': 0.8}
+    point = np.array([0.0, 4.0, 1.1, 0.3])
+    curvature = tensors.Curvature(tensors.kerr_metric, *point, **params)
+
+    def metric(x):
+        g = np.zeros((4, 4))
+        for (m, n), value in tensors.kerr_metric(*x, **params).items():
+            g[m, n] = g[n, m] = value
+        return g
+
+    h = 1e-5
+    dg = np.array([(metric(point + h * e) - metric(point - h * e)) / (2 * h) for e in np.eye(4)])
+    first = 0.5 * (dg.transpose(1, 2, 0) + dg.transpose(1, 0, 2) - dg)  # Gamma_{a m n}
+    expected = np.einsum('la,amn->lmn', np.linalg.inv(metric(point)), first)
+    np.testing.assert_allclose(curvature.full('christoffel'), expected, atol=1e-8)
+
+
+def test_constant_curvature_scalars():
+    def sphere(theta, phi, a=1.0):
+        return {(0, 0): a**2, (1, 1): (a * np.sin(theta))**2}
+
+    def de_sitter(t, r, theta, phi, L=1.0):
+        f = 1 - (r / L)**2
+        return {(0, 0): -f, (1, 1): 1 / f, (2, 2): r**2, (3, 3): (r * np.sin(theta))**2}
+
+    sphere_curvature = tensors.Curvature(sphere, THETA, 0.0, a=2.0)
+    np.testing.assert_allclose(sphere_curvature.ricci_scalar, 2 / 2.0**2)
+    desitter = tensors.Curvature(de_sitter, 0.0, np.linspace(0.1, 2.5, 7)[:, None], THETA, 0.0, L=3.0)
+    np.testing.assert_allclose(desitter.ricci_scalar, 12 / 3.0**2)
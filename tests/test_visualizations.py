@@ -0,0 +1,96 @@
+import pytest
+
+import visualizations
+
+
+def _figure(key):
+    return next(figure for figure in visualizations.FIGURES if figure.key == key)
+
+
+def test_cache_key_is_stable():
+    figure = _figure('tensor_indices')
+    params = visualizations.figure_params(figure)
+    assert visualizations.figure_cache_key(figure.func, params) == \
+        visualizations.figure_cache_key(figure.func, params)
+
+
+def test_style_change_misses_cache(monkeypatch):
+    figure = _figure('tensor_indices')
+    params = visualizations.figure_params(figure)
+    before = visualizations.figure_cache_key(figure.func, params)
+    monkeypatch.setitem(visualizations.STYLE, 'font.size', visualizations.STYLE['font.size'] + 1)
+    assert visualizations.figure_cache_key(figure.func, params) != before
+
+
+def test_surface_override_misses_cache():
+    figure = _figure('spacetime_curvature')
+    mesh = visualizations.figure_params(figure)
+    raster = visualizations.figure_params(figure, overrides={'surface': 'raster', 'unused': 1})
+    assert raster == {**mesh, 'surface': 'raster'}
+    assert visualizations.figure_cache_key(figure.func, raster) != \
+        visualizations.figure_cache_key(figure.func, mesh)
+
+
+def test_raster_surface_is_capped_in_producer():
+    import figuredata
+
+    data = figuredata.spacetime_curvature(n=figuredata.SURFACE_RASTER_MAX + 500, n_slice=20,
+                                          surface='raster')
+    assert data['Z'].shape == (figuredata.SURFACE_RASTER_MAX,) * 2
+
+
+def test_render_refuses_oversized_image():
+    with pytest.raises(ValueError, match="Mpx limit"):
+        visualizations.render_figure(_figure('tensor_indices'), {'dpi': 1200}, profile='print',
+                                     max_pixels=40e6)
+
+
+def test_select_figures_by_key_stem_or_title():
+    figures = visualizations.FIGURES
+    assert visualizations.select_figures(figures, []) == list(figures)
+    picked = visualizations.select_figures(figures, ['Light-Bending', '03_metric_tensor', 'Geodesics'])
+    assert [f.key for f in picked] == ['light_bending', 'metric_tensor', 'geodesics']
+    with pytest.raises(ValueError, match="unknown figure.*nope"):
+        visualizations.select_figures(figures, ['geodesics', 'nope'])
+
+
+def test_profiles_scale_samples_and_set_dpi():
+    figure = _figure('spacetime_curvature')
+    web = visualizations.figure_params(figure, 'web')
+    assert web['dpi'] == figure.dpi and web['r_s'] == 2.0
+    assert {k: web[k] for k in figure.samples} == figure.samples
+    for name, (scale, dpi) in visualizations.PROFILES.items():
+        params = visualizations.figure_params(figure, name)
+        assert params['dpi'] == (dpi or figure.dpi)
+        assert all(params[k] == max(2, round(n * scale)) for k, n in figure.samples.items())
+    assert visualizations.figure_params(_figure('tensor_indices'), 'preview') == {'dpi': 72}
+
+
+def test_tensor_indices_draws_through_figure_data(monkeypatch):
+    import matplotlib.pyplot as plt
+
+    import figuredata
+
+    calls = []
+    original = visualizations.figure_data
+    monkeypatch.setattr(visualizations, 'figure_data',
+                        lambda producer, **params: calls.append(producer) or original(producer, **params))
+    monkeypatch.setattr(visualizations, 'export_figure', lambda fig, *args: (plt.close(fig), {}))
+    visualizations.render_figure(_figure('tensor_indices'))
+    assert calls == [figuredata.tensor_indices]
+
+
+def test_serial_render_keeps_callers_backend(tmp_path, monkeypatch):
+    import matplotlib
+
+    previous = matplotlib.get_backend()
+    matplotlib.use('pdf')
+    try:
+        monkeypatch.setattr(visualizations, 'OUTPUT_DIR', str(tmp_path))
+        monkeypatch.setattr(visualizations, '_data_cache', None)
+        report = visualizations.render_figures([_figure('tensor_indices')], jobs=1, data_cache=False,
+                                               manifest_path=str(tmp_path / 'manifest.json'))
+        assert report[0][2] == 'rebuilt'
+        assert matplotlib.get_backend() == 'pdf'
+    finally:
+        matplotlib.use(previous)
@@ -0,0 +1,24 @@
+import warnings
+
+import numpy as np
+import pytest
+
+import waveforms
+
+
+@pytest.mark.parametrize('dtype', [np.float64, np.float32])
+def test_taylorf2_zero_frequency_is_masked(dtype):
+    f = np.fft.rfftfreq(4096, 1 / 2048)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        hp, hc = waveforms.taylorf2(f, [30.0, 1.4], [20.0, 1.3], dtype=dtype)
+    assert np.isfinite(hp).all() and np.isfinite(hc).all()
+    assert (hp[:, 0] == 0).all() and (hc[:, 0] == 0).all()
+    above = f > waveforms.isco_frequency(30.0, 20.0)
+    assert (hp[0, above] == 0).all()
+    assert np.abs(hp[:, 1:]).max() > 0
+
+
+def test_chirp_time_series_is_finite():
+    _, strain = waveforms.chirp_time_series(30.0, 20.0, duration=1.0)
+    assert np.isfinite(strain).all()
@@ -0,0 +1,207 @@
+"""
+Validation - The README's Worked Examples, Computed and Checked
+===============================================================
+Every number quoted in Part 5 and the Quick Reference Guide, recomputed.
+
+Each check evaluates a worked example or quick-reference equation with
+the project's own modules where one applies (`tensors` for the field
+equations, `metrics` for clock rates, `lensing` for the exact deflection,
+`geodesics` for perihelion precession) and with the closed-form formula
+otherwise, then compares it with the value the README states. All checks
+are compared in one vectorized pass: a check passes when
+
+    |value - expected| <= atol + rtol * |expected|
+
+The tolerances reflect how the README rounds (1.75", 6.95e-10, ~38 us)
+and are far tighter for identities and exact values (G_mn = 0 in
+vacuum, the horizon at 2M, the ISCO at 6M). A value is never compared
+with the formula that computed it. The whole set runs in well under a
+second, so `visualizations.py` runs it before rendering and stops if any
+fails.
+
+    python validation.py            # table of every check
+    python validation.py --failed   # only the failures
+"""
+
+import argparse
+import time
+from collections import namedtuple
+
+import numpy as np
+
+import geodesics
+import lensing
+import metrics
+import tensors
+import waveforms
+
+# SI constants (CODATA 2018, IAU 2015 nominal values)
+G = 6.67430e-11
+C = 299792458.0
+GM_SUN = 1.3271244e20
+GM_EARTH = 3.986004e14
+DAY = 86400.0
+ARCSEC = np.pi / (180 * 3600)
+
+# Inputs as the README's examples state them
+R_EARTH = 6.37e6     # Example 2, Earth's surface
+R_SUN = 6.96e8       # Example 3, light grazing the Sun
+R_GPS = 2.656e7      # GPS orbit radius, altitude ~20,200 km
+MERCURY = (5.7909e10, 0.2056, 87.969)  # semi-major axis (m), eccentricity, period (days)
+
+TIME_BUDGET = 1.0    # seconds for the whole set
+
+Check = namedtuple('Check', 'section name value expected rtol atol unit')
+
+
+def schwarzschild_checks():
+    """Example 1: the Schwarzschild metric, its vacuum field equations and clock rate."""
+    r = np.linspace(2.5, 50, 64)[:, None]
+    theta = np.linspace(0.1, np.pi - 0.1, 32)[None, :]
+    vacuum = tensors.Curvature(tensors.schwarzschild_metric, 0.0, r, theta, 0.0, M=1.0)
+    flat = tensors.Curvature(tensors.schwarzschild_metric, 0.0, r, theta, 0.0, M=0.0)
+
+    # `metrics` against values fixed independently of its formulas: the
+    # horizon and ISCO radii, and the metric at a few radii (r_s = 2M = 2)
+    hole = metrics.Schwarzschild(1.0)
+    g = hole.components(np.array([2.0, 3.0, 4.0]), np.pi / 2)
+    far = hole.components(np.array([1e12]), np.pi / 2)
+    dilation = hole.time_dilation(np.array([2.0, 3.0, 4.0]), np.pi / 2)
+    return [
+        Check('Example 1', 'event horizon r_s = 2M (metrics.horizons)', hole.horizons()[0], 2.0, 1e-15, 0.0, 'M'),
+        Check('Example 1', 'g_tt = 0 at the horizon r = 2M', g[(0, 0)][0], 0.0, 0.0, 1e-15, ''),
+        Check('Example 1', 'g_tt = -1/2, g_rr = 2 at r = 4M, max rel. error',
+              max(abs(g[(0, 0)][2] / -0.5 - 1), abs(g[(1, 1)][2] / 2 - 1)), 0.0, 0.0, 1e-14, ''),
+        Check('Example 1', 'vacuum field equations G_mn = 0, max |G_mn|',
+              max(np.max(np.abs(v)) for v in vacuum.einstein.values()), 0.0, 0.0, 1e-12, 'M^-2'),
+        Check('Example 1', 'r -> infinity: g_tt -> -1 (at r = 1e12 M)', far[(0, 0)][0], -1.0, 0.0, 1e-11, ''),
+        Check('Quick Reference', 'Minkowski in spherical coordinates: R_abcd = 0, max |R_abcd|',
+              max(np.max(np.abs(v)) for v in flat.riemann.values()), 0.0, 0.0, 1e-9, ''),
+        Check('Quick Reference', 'dtau/dt = 0 at the horizon', dilation[0], 0.0, 0.0, 1e-15, ''),
+        Check('Quick Reference', 'dtau/dt = 1/sqrt(3) at the photon sphere r = 3M',
+              dilation[1], 1 / np.sqrt(3), 1e-14, 0.0, ''),
+        Check('Quick Reference', 'dtau/dt = 1/sqrt(2) at r = 4M', dilation[2], np.sqrt(0.5), 1e-14, 0.0, ''),
+        Check('Quick Reference', 'ISCO at r = 3 r_s = 6M (metrics.isco)', hole.isco(), 6.0, 1e-14, 0.0, 'M'),
+        Check('Figure 3', 'Kerr a = 0.9M outer horizon r_+', metrics.Kerr(1.0, 0.9).horizons()[0],
+              1.44, 5e-3, 0.0, 'M'),
+    ]
+
+
+def time_dilation_checks():
+    """Example 2: clocks on Earth's surface and on a GPS satellite."""
+    # Static clock on the ground and circular orbit at R_GPS: (dtau/dt)^2 = 1 - 2GM/(c^2 r) - v^2/c^2
+    r = np.array([R_EARTH, R_GPS])
+    v2 = np.array([0.0, GM_EARTH / R_GPS])
+    x = 2 * GM_EARTH / (C**2 * r) + v2 / C**2
+    log_rate = 0.5 * np.log1p(-x)    # log(dtau/dt), kept to full precision near 1
+    surface = GM_EARTH / (C**2 * R_EARTH)
+    gain = np.expm1(log_rate[1] - log_rate[0]) * DAY
+    return [
+        Check('Example 2', 'GM/(c^2 R) at Earth\'s surface', surface, 6.95e-10, 5e-3, 0.0, ''),
+        Check('Example 2', 'weak field 1 - dtau/dt = GM/(c^2 r), vs exact',
+              -np.expm1(log_rate[0]), surface, 1e-6, 0.0, ''),
+        Check('Example 2', 'GPS satellite clock gain per day', gain * 1e6, 38.0, 0.05, 0.0, 'us/day'),
+        Check('Example 2', 'GPS ranging error per day uncorrected', gain * C / 1e3, 10.0, 0.2, 0.0, 'km/day'),
+    ]
+
+
+def light_bending_checks():
+    """Example 3: light grazing the Sun, with Newton's half and the exact integral."""
+    b = R_SUN * C**2 / GM_SUN    # impact parameter in units of M
+    weak = 4 / b
+    # The README's own arithmetic, with its rounded constants
+    stated = 4 * 6.67e-11 * 1.99e30 / ((3e8)**2 * 6.96e8)
+    exact = lensing.deflection_exact(np.array([b]))[0]
+    return [
+        Check('Example 3', 'deflection 4GM/(c^2 b) at b = R_sun', weak / ARCSEC, 1.75, 5e-3, 0.0, 'arcsec'),
+        Check('Example 3', 'same, with the README\'s rounded G, M, c', stated / ARCSEC, 1.75, 5e-3, 0.0, 'arcsec'),
+        Check('Example 3', 'exact Schwarzschild deflection (lensing)', exact / ARCSEC, 1.75, 5e-3, 0.0, 'arcsec'),
+        Check('Example 3', 'Newtonian deflection 2GM/(c^2 b)', weak / 2 / ARCSEC, 0.87, 1e-2, 0.0, 'arcsec'),
+    ]
+
+
+def quick_reference_checks():
+    """The Quick Reference Guide's constants and useful results."""
+    a, e, period = MERCURY
+    per_orbit = 6 * np.pi * GM_SUN / (a * C**2 * (1 - e**2))
+    # The formula is the weak-field limit: integrated geodesics agree to O(M/a)
+    a_test = 1e4
+    integrated = geodesics.periapsis_precession(np.array([a_test]), e, 1.0)[0]
+
+    # Quadrupole strain of a GW150914-like binary at 150 Hz, 410 Mpc
+    m1, m2, f, distance = 36.0, 29.0, 150.0, 410.0
+    chirp_mass = (m1 * m2)**0.6 / (m1 + m2)**0.2 * waveforms.MSUN_S
+    strain = 4 * chirp_mass**(5 / 3) * (np.pi * f)**(2 / 3) / (distance * waveforms.MPC_S)
+
+    kerr = metrics.Kerr(1.0, 0.9)
+    r = np.linspace(2.0, 50, 64)[:, None]
+    theta = np.linspace(0.1, np.pi - 0.1, 32)[None, :]
+    identity = np.einsum('...ij,...jk->...ik', kerr.inverse_metric(r, theta), kerr.metric(r, theta))
+    return [
+        Check('Quick Reference', 'Einstein constant 8 pi G / c^4', 8 * np.pi * G / C**4, 2.077e-43, 1e-3, 0.0,
+              's^2 kg^-1 m^-1'),
+        Check('Quick Reference', 'Mercury perihelion precession', per_orbit * 36525 / period / ARCSEC,
+              43.0, 1e-2, 0.0, 'arcsec/century'),
+        Check('Quick Reference', f'precession formula vs integrated geodesic (a = {a_test:g} M)',
+              integrated, 6 * np.pi / (a_test * (1 - e**2)), 1e-3, 0.0, 'rad/orbit'),
+        Check('Quick Reference', 'LIGO strain h ~ 1e-21 (log10 h, GW150914-like)', np.log10(strain),
+              -21.0, 0.0, 0.5, ''),
+        Check('Quick Reference', 'inverse metric g^mr g_rn = delta (Kerr a = 0.9M), max error',
+              np.max(np.abs(identity - np.eye(4))), 0.0, 0.0, 1e-12, ''),
+    ]
+
+
+GROUPS = (schwarzschild_checks, time_dilation_checks, light_bending_checks, quick_reference_checks)
+
+
+def run_checks(groups=GROUPS):
+    """Evaluate every check; returns (checks, passed) with `passed` a boolean array."""
+    checks = [check for group in groups for check in group()]
+    value, expected, rtol, atol = (np.array([getattr(c, field) for c in checks], dtype=float)
+                                   for field in ('value', 'expected', 'rtol', 'atol'))
+    passed = np.abs(value - expected) <= atol + rtol * np.abs(expected)
+    return checks, passed
+
+
+def _row(check, ok):
+    return (f"{'✓' if ok else '✗'} {check.section:<16} {check.name:<64} "
+            f"{check.value:12.5g} {check.expected:10.4g} {check.unit}").rstrip()
+
+
+def validate():
+    """Run every check as a pre-render gate: print a summary and the failures; True if all pass."""
+    start = time.perf_counter()
+    checks, passed = run_checks()
+    elapsed = time.perf_counter() - start
+    for check, ok in zip(checks, passed):
+        if not ok:
+            print(_row(check, ok))
+    status = '✓' if passed.all() else '✗'
+    print(f"{status} README checks: {passed.sum()} of {len(checks)} passed ({elapsed * 1e3:.0f} ms)")
+    return bool(passed.all())
+
+
+def main(argv=None):
+    """Print every check and exit non-zero if any fails."""
+    parser = argparse.ArgumentParser(description="Check the README's worked examples numerically.")
+    parser.add_argument('--failed', action='store_true', help="only print failing checks")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    checks, passed = run_checks()
+    elapsed = time.perf_counter() - start
+    print(f"  {'section':<16} {'check':<64} {'value':>12} {'expected':>10} unit")
+    for check, ok in zip(checks, passed):
+        if ok and args.failed:
+            continue
+        print(_row(check, ok))
+    failed = len(checks) - int(passed.sum())
+    print(f"\n{len(checks) - failed} of {len(checks)} checks passed in {elapsed * 1e3:.0f} ms "
+          f"(budget {TIME_BUDGET * 1e3:.0f} ms)")
+    if elapsed > TIME_BUDGET:
+        print("✗ over the time budget")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
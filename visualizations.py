@@ -2,44 +2,193 @@
 General Relativity Visualizations - Core Concepts
 ==================================================
 Simplified visualizations focusing on essential GR concepts.
+
+Each visualize_* function builds and returns its figure: it takes the
+arrays from a pure producer in `figuredata` (through `figure_data`, which
+memoizes them on disk when a data cache is set) and draws them with the
+matching draw_* renderer. `render_figure` encodes a registered figure in
+memory (PNG, SVG, WebP or PDF, at a dpi or fitted to a pixel size) and
+the CLI writes those bytes to disk.
+
+numpy, matplotlib and the numerical modules are imported inside the
+figure functions, so importing this module, `--help` and `--list` stay
+fast and free of side effects; the Agg backend and the style are only set
+up when figures are rendered.
 """
 
-import numpy as np
-import matplotlib.pyplot as plt
+import argparse
+import hashlib
+import inspect
+import json
 import os
+import time
+from collections import namedtuple
+
+import profiling
+
+STYLE = {'figure.figsize': (12, 8), 'font.size': 10}
+
+OUTPUT_DIR = 'visualizations'
+
+# Export formats: extension -> MIME type
+FORMATS = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml',
+    'webp': 'image/webp',
+    'pdf': 'application/pdf',
+}
+
+
+def _finish_figure(fig, tight_layout=True):
+    """Lay out a finished figure (timed as the 'layout' phase) and return it."""
+    if tight_layout:
+        with profiling.phase('layout'):
+            fig.tight_layout()
+    return fig
+
+
+# Figure data is memoized on disk only when a cache is set (the CLI and the
+# server's workers set one up; see set_data_cache).
+DATA_CACHE_DIR = 'visualizations/.data-cache'
+DATA_CACHE_BYTES = 256 * 2**20
+_data_cache = None
+_producer_digests = {}
+
+
+def set_data_cache(enabled=True, directory=DATA_CACHE_DIR, max_bytes=DATA_CACHE_BYTES):
+    """Memoize figure data in this process in a `datacache.DataCache` (or stop, if not `enabled`)."""
+    global _data_cache
+    import datacache
+
+    _data_cache = datacache.DataCache(directory, max_bytes) if enabled else None
+    return _data_cache
+
+
+def _data_key(producer, params):
+    """Cache key for producer(**params): its source and the project code it calls, params, numpy."""
+    import numpy as np
+
+    name = f"{producer.__module__}.{producer.__qualname__}"
+    if name not in _producer_digests:
+        # computed once per process: the producer's code does not change under it
+        digest = hashlib.sha256(np.__version__.encode())
+        for dep, source in _dependency_sources(producer, set()):
+            digest.update(dep.encode())
+            digest.update(source.encode())
+        _producer_digests[name] = digest.hexdigest()
+    payload = json.dumps([name, _producer_digests[name], params], sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def figure_data(producer, **params):
+    """producer(**params) as a dict of arrays, timed as the 'data' phase.
+
+    Goes through the on-disk data cache when one is set. Either way 0-d
+    arrays come back as NumPy scalars, so a figure draws the same from
+    fresh and cached data.
+    """
+    import numpy as np
+
+    with profiling.phase('data'):
+        data = None
+        if _data_cache is not None:
+            key = _data_key(producer, params)
+            data = _data_cache.get(key)
+        if data is None:
+            data = {name: np.asarray(value) for name, value in producer(**params).items()}
+            if _data_cache is not None:
+                _data_cache.put(key, data)
+        return {name: a[()] if a.ndim == 0 else a for name, a in data.items()}
+
+
+# Rendering budget for the rubber-sheet surface: plot_surface builds and
+# depth-sorts one polygon per face, so its cost grows with the face count.
+# (The raster backend's grid is capped by figuredata.SURFACE_RASTER_MAX.)
+SURFACE_FACES = 40000
+
+
+def visualize_spacetime_curvature(n=80, n_radial=150, r_s=2.0, n_slice=300, spin=0.9,
+                                  surface='mesh', max_faces=SURFACE_FACES):
+    """Visualize spacetime curvature - the rubber sheet analogy and a real invariant.
+
+    surface='mesh' draws the well as a 3D surface thinned to at most
+    `max_faces` faces (see `surface_lod`); surface='raster' draws it as a
+    hill-shaded image with contour lines, whose cost is bounded by
+    figuredata.SURFACE_RASTER_MAX pixels a side however large `n` is.
+    """
+    import figuredata
+
+    return draw_spacetime_curvature(figure_data(figuredata.spacetime_curvature, n=n, n_radial=n_radial,
+                                                r_s=r_s, n_slice=n_slice, spin=spin, surface=surface),
+                                    max_faces=max_faces)
+
+
+def surface_lod(shape, max_faces=SURFACE_FACES):
+    """Row and column indices of a mesh of `shape` vertices to draw with plot_surface.
+
+    Every vertex if the mesh has at most `max_faces` faces; otherwise
+    every k-th row and column (plus the last), with the same stride on
+    both axes, so a mesh sampled adaptively keeps its nodes densest where
+    they were. Drawing the thinned mesh at stride 1 keeps plot_surface on
+    its vectorized path, which rcount/ccount strides that do not divide
+    the mesh fall off.
+    """
+    import numpy as np
+
+    rows, cols = shape
+    stride = max(1, int(np.ceil(((rows - 1) * (cols - 1) / max_faces) ** 0.5)))
+    return tuple(np.union1d(np.arange(0, size, stride), [size - 1]) for size in shape)
+
+
+def draw_well(fig, position, data, max_faces=SURFACE_FACES):
+    """Add the rubber-sheet well in `data` to `fig` at subplot `position`; returns its axes.
+
+    A 3D surface thinned to `max_faces` faces, or for surface='raster'
+    data, a hill-shaded image with contour lines.
+    """
+    import matplotlib
+    import matplotlib.pyplot as plt
+    import numpy as np
+
+    if data['surface'] == 'raster':
+        # Hill-shaded image of the well from above, with equipotential contours
+        ax = fig.add_subplot(position)
+        x, Z = data['x'], data['Z']
+        light = matplotlib.colors.LightSource(azdeg=315, altdeg=35)
+        ax.imshow(light.shade(Z, plt.get_cmap('viridis'), blend_mode='soft', dx=x[1] - x[0], dy=x[1] - x[0]),
+                  extent=(x[0], x[-1], x[0], x[-1]), origin='lower')
+        ax.contour(x, x, Z, levels=12, colors='k', linewidths=0.6, alpha=0.5)
+        ax.set_aspect('equal')
+    else:
+        # 3D surface: the gravitational well on a polar mesh
+        ax = fig.add_subplot(position, projection='3d')
+        lod = np.ix_(*surface_lod(data['Z'].shape, max_faces))
+        ax.plot_surface(data['X'][lod], data['Y'][lod], data['Z'][lod], rstride=1, cstride=1,
+                        cmap='viridis', alpha=0.8, edgecolor='none')
+        ax.set_zlabel('Curvature')
+        ax.view_init(25, 45)
+    ax.set_xlabel('X')
+    ax.set_ylabel('Y')
+    ax.set_title('Spacetime Curvature (Rubber Sheet)', fontweight='bold')
+    return ax
+
+
+def draw_spacetime_curvature(data, max_faces=SURFACE_FACES):
+    """Render the spacetime curvature figure from `figuredata.spacetime_curvature` output."""
+    import matplotlib
+    import matplotlib.pyplot as plt
+    import numpy as np
 
-# Set style
-plt.rcParams['figure.figsize'] = (12, 8)
-plt.rcParams['font.size'] = 10
-os.makedirs('visualizations', exist_ok=True)
-
-
-def visualize_spacetime_curvature():
-    """Visualize spacetime curvature - the rubber sheet analogy."""
-    fig = plt.figure(figsize=(14, 6))
-    ax1 = fig.add_subplot(121, projection='3d')
-    ax2 = fig.add_subplot(122)
-    
-    # Create curved spacetime surface
-    x = np.linspace(-10, 10, 80)
-    y = np.linspace(-10, 10, 80)
-    X, Y = np.meshgrid(x, y)
-    R = np.maximum(np.sqrt(X**2 + Y**2), 0.5)
-    Z = -1.0 / R  # Gravitational well
-    
-    # 3D surface
-    ax1.plot_surface(X, Y, Z, cmap='viridis', alpha=0.8, edgecolor='none')
-    ax1.set_xlabel('X')
-    ax1.set_ylabel('Y')
-    ax1.set_zlabel('Curvature')
-    ax1.set_title('Spacetime Curvature (Rubber Sheet)', fontweight='bold')
-    ax1.view_init(25, 45)
+    spin, M, r_plus = data['spin'], data['M'], data['r_plus']
+    fig = plt.figure(figsize=(20, 6))
+    draw_well(fig, 131, data, max_faces)
+    ax2 = fig.add_subplot(132)
+    ax3 = fig.add_subplot(133)
     
     # Cross-section
-    r = np.linspace(0.5, 10, 150)
-    z = -1.0 / r
+    r, z = data['r'], data['z']
     ax2.plot(r, z, 'b-', linewidth=3)
-    ax2.axvline(x=2, color='r', linestyle='--', label='Event Horizon (r=2M)')
+    ax2.axvline(x=data['r_s'], color='r', linestyle='--', label='Event Horizon (r=2M)')
     ax2.fill_between(r, z, 0, alpha=0.2)
     ax2.set_xlabel('Radial Distance')
     ax2.set_ylabel('Potential')
@@ -47,31 +196,50 @@ def visualize_spacetime_curvature():
     ax2.legend()
     ax2.grid(alpha=0.3)
     
-    plt.tight_layout()
-    plt.savefig('visualizations/01_spacetime_curvature.png', dpi=200, bbox_inches='tight')
-    print("✓ Saved: 01_spacetime_curvature.png")
-    plt.close()
+    # Kretschmann scalar K = R_abcd R^abcd in the meridional plane of a spinning hole
+    image = ax3.pcolormesh(data['xs'], data['xs'], data['K'], cmap='RdBu_r', shading='auto',
+                           norm=matplotlib.colors.SymLogNorm(1e-3, vmin=-1e2, vmax=1e2))
+    fig.colorbar(image, ax=ax3, label='$K M^4$ (symlog)')
+    # r = const is an oblate spheroid in Kerr-Schild Cartesian coordinates
+    ax3.add_patch(matplotlib.patches.Ellipse((0, 0), 2 * np.hypot(r_plus, spin * M), 2 * r_plus,
+                                             fill=False, ec='k', ls='--', lw=1.5,
+                                             label=f'Horizon $r_+$ (a = {spin}M)'))
+    ax3.plot(data['ergo_x'], data['ergo_z'], 'k:', lw=1.5, label='Ergosphere')
+    ax3.set_aspect('equal')
+    ax3.set_xlabel('x / M')
+    ax3.set_ylabel('z / M')
+    ax3.set_title('Kretschmann Scalar (Kerr)', fontweight='bold')
+    ax3.legend(loc='upper right')
+    
+    return _finish_figure(fig)
 
 
-def visualize_light_bending():
-    """Visualize gravitational lensing."""
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+def visualize_light_bending(n_rays=8, n_samples=150, M=0.25, image_size=400):
+    """Visualize gravitational lensing with exact Schwarzschild light rays."""
+    import figuredata
+
+    return draw_light_bending(figure_data(figuredata.light_bending, n_rays=n_rays, n_samples=n_samples,
+                                          M=M, image_size=image_size))
+
+
+def draw_light_bending(data):
+    """Render the light bending figure from `figuredata.light_bending` output."""
+    import matplotlib.pyplot as plt
+
+    fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(20, 6))
     
+    # Null geodesics entering from x = -10 at heights y (mirrored for y > 0)
+    heights, x_ray, y_ray = data['heights'], data['x_ray'], data['y_ray']
     for ax, curved in [(ax1, False), (ax2, True)]:
         ax.set_xlim(-10, 10)
         ax.set_ylim(-8, 8)
         ax.add_patch(plt.Circle((0, 0), 0.5, color='gold', ec='orange', lw=2))
         
         # Light rays
-        for y in np.linspace(-7, 7, 8):
-            if abs(y) < 0.6:
-                continue
-            x = np.linspace(-10, 10, 150)
+        for k, y in enumerate(heights):
             if curved:
-                deflection = 4 / abs(y)  # Simplified deflection
-                y_path = y + deflection * (x**2 - 100) / 100
-                mask = np.sqrt(x**2 + y_path**2) > 0.5
-                ax.plot(x[mask], y_path[mask], 'r-', lw=1.5, alpha=0.7)
+                captured = data['captured'][k]
+                ax.plot(x_ray[:, k], y_ray[:, k], 'k-' if captured else 'r-', lw=1.5, alpha=0.7)
             else:
                 ax.arrow(-10, y, 19.5, 0, head_width=0.3, head_length=0.5, 
                         fc='r', ec='r', lw=1.5, alpha=0.7)
@@ -81,24 +249,40 @@ def visualize_light_bending():
         ax.grid(alpha=0.3)
         ax.set_aspect('equal')
     
-    plt.tight_layout()
-    plt.savefig('visualizations/02_light_bending.png', dpi=200, bbox_inches='tight')
-    print("✓ Saved: 02_light_bending.png")
-    plt.close()
+    # Lensed background grid: lens halfway to the source, field of view 6 Einstein radii
+    ax3.imshow(data['image'], extent=(-3, 3, -3, 3))
+    ax3.add_patch(plt.Circle((0, 0), 1, fill=False, ec='white', ls='--', lw=1, alpha=0.7))
+    ax3.set_xlabel('$\\theta_x / \\theta_E$')
+    ax3.set_ylabel('$\\theta_y / \\theta_E$')
+    ax3.set_title('Lensed Background Grid\n(Einstein ring at $\\theta_E$)', fontweight='bold')
+    
+    return _finish_figure(fig)
 
 
-def visualize_metric_tensor():
+def visualize_metric_tensor(n=150, r_s=2.0, spin=0.9):
     """Visualize metric tensor components."""
+    import figuredata
+
+    return draw_metric_tensor(figure_data(figuredata.metric_tensor, n=n, r_s=r_s, spin=spin))
+
+
+def draw_metric_tensor(data):
+    """Render the metric tensor figure from `figuredata.metric_tensor` output."""
+    import matplotlib.pyplot as plt
+    import numpy as np
+
     fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-    
-    r = np.linspace(0.1, 10, 150)
-    r_s = 2.0  # Schwarzschild radius
+    r_s, r_plus, spin = data['r_s'], data['r_plus'], data['spin']
+    dilation = data['dilation']
+    flat = np.array([0.1, 10])
     
     # Time component g_tt
     ax1 = axes[0]
-    ax1.plot(r, -np.ones_like(r), 'b--', lw=2, label='Flat (Minkowski)')
-    ax1.plot(r, -(1 - r_s/r), 'r-', lw=3, label='Curved (Schwarzschild)')
+    ax1.plot(flat, [-1, -1], 'b--', lw=2, label='Flat (Minkowski)')
+    ax1.plot(data['r'], data['g_tt'], 'r-', lw=3, label='Curved (Schwarzschild)')
+    ax1.plot(data['r_k'], data['g_tphi'], 'm-', lw=2, label=f'$g_{{t\\phi}}$ (Kerr, a = {spin}M)')
     ax1.axvline(r_s, color='orange', ls='--', lw=2, label='Event Horizon')
+    ax1.axvline(r_plus, color='m', ls=':', lw=2, label='Kerr Horizon $r_+$')
     ax1.axhline(0, color='k', ls=':', alpha=0.3)
     ax1.set_xlabel('Radial Distance')
     ax1.set_ylabel('$g_{tt}$')
@@ -109,10 +293,12 @@ def visualize_metric_tensor():
     
     # Time dilation
     ax2 = axes[1]
-    ax2.plot(r, np.ones_like(r), 'b--', lw=2, label='Flat')
-    ax2.plot(r, np.sqrt(np.abs(1 - r_s/r)), 'g-', lw=3, label='Curved')
+    ax2.plot(flat, [1, 1], 'b--', lw=2, label='Flat')
+    ax2.plot(data['r_d'], dilation, 'g-', lw=3, label='Curved')
+    ax2.plot(data['r_z'], data['lapse'], 'm-', lw=2, label=f'Kerr ZAMO (a = {spin}M)')
     ax2.axvline(r_s, color='orange', ls='--', lw=2)
-    ax2.fill_between(r, 0, np.sqrt(np.abs(1 - r_s/r)), alpha=0.2, color='g')
+    ax2.axvline(r_plus, color='m', ls=':', lw=2)
+    ax2.fill_between(data['r_d'], 0, dilation, where=np.isfinite(dilation), alpha=0.2, color='g')
     ax2.set_xlabel('Radial Distance')
     ax2.set_ylabel('$d\\tau/dt$')
     ax2.set_title('Time Dilation Factor', fontweight='bold')
@@ -120,14 +306,13 @@ def visualize_metric_tensor():
     ax2.grid(alpha=0.3)
     ax2.set_ylim(0, 1.2)
     
-    plt.tight_layout()
-    plt.savefig('visualizations/03_metric_tensor.png', dpi=200, bbox_inches='tight')
-    print("✓ Saved: 03_metric_tensor.png")
-    plt.close()
+    return _finish_figure(fig)
 
 
 def visualize_curvature_tensors():
     """Visualize tensor contraction flow."""
+    import matplotlib.pyplot as plt
+
     fig, ax = plt.subplots(figsize=(10, 9))
     ax.set_xlim(0, 10)
     ax.set_ylim(0, 10)
@@ -173,21 +358,29 @@ def visualize_curvature_tensors():
             bbox=dict(boxstyle='round,pad=0.6', fc='lightcyan', ec='darkblue', lw=3))
     ax.text(5, 0.3, 'Field Equation', ha='center', fontsize=11, fontweight='bold')
     
-    plt.savefig('visualizations/04_curvature_tensors.png', dpi=200, bbox_inches='tight')
-    print("✓ Saved: 04_curvature_tensors.png")
-    plt.close()
+    return _finish_figure(fig, tight_layout=False)
 
 
 def visualize_tensor_indices():
     """Visualize contravariant vs covariant components using standard geometric construction."""
+    import figuredata
+
+    return draw_tensor_indices(figure_data(figuredata.tensor_indices))
+
+
+def draw_tensor_indices(data):
+    """Render the tensor indices figure from `figuredata.tensor_indices` output."""
+    import matplotlib.pyplot as plt
+    import numpy as np
+
     fig, axes = plt.subplots(1, 3, figsize=(18, 6))
     
     # Common vector for both panels
-    vector_x, vector_y = 3.0, 2.5
+    vector_x, vector_y = data['vector']
     
     # Basis vectors (non-orthogonal) - matching the reference style
-    e1_x, e1_y = 2.0, 0.2
-    e2_x, e2_y = 0.7, 1.8
+    e1_x, e1_y = data['e1']
+    e2_x, e2_y = data['e2']
     
     # Left Panel: Contravariant Components (Parallel Projections)
     ax1 = axes[0]
@@ -206,13 +399,8 @@ def visualize_tensor_indices():
     ax1.arrow(0, 0, vector_x, vector_y, head_width=0.15, head_length=0.15, fc='darkgreen', ec='darkgreen', lw=3.5, length_includes_head=True, zorder=10)
     ax1.text(vector_x + 0.15, vector_y + 0.15, '$\\mathbf{v}$', fontsize=14, fontweight='bold', color='darkgreen')
     
-    # Contravariant components: PARALLEL lines to basis vectors
-    # Find v^1 and v^2 by solving: v = v^1*e1 + v^2*e2
-    # [e1_x, e2_x] [v^1]   [vector_x]
-    # [e1_y, e2_y] [v^2] = [vector_y]
-    det = e1_x * e2_y - e2_x * e1_y
-    v1_contra = (vector_x * e2_y - vector_y * e2_x) / det
-    v2_contra = (e1_x * vector_y - e1_y * vector_x) / det
+    # Contravariant components: PARALLEL lines to basis vectors, v = v^1*e1 + v^2*e2
+    v1_contra, v2_contra = data['contravariant']
     
     # Draw parallel lines
     # Line parallel to e2 through tip of v (to find v^1)
@@ -259,20 +447,9 @@ def visualize_tensor_indices():
     ax2.arrow(0, 0, vector_x, vector_y, head_width=0.15, head_length=0.15, fc='darkgreen', ec='darkgreen', lw=3.5, length_includes_head=True, zorder=10)
     ax2.text(vector_x + 0.15, vector_y + 0.15, '$\\mathbf{v}$', fontsize=14, fontweight='bold', color='darkgreen')
     
-    # Calculate perpendicular projections properly
-    # Project v onto e1: v_dot_e1 = (v·e1) / |e1|²
-    e1_dot_e1 = e1_x**2 + e1_y**2
-    v_dot_e1 = vector_x * e1_x + vector_y * e1_y
-    proj_e1_scalar = v_dot_e1 / e1_dot_e1
-    proj_e1_x = proj_e1_scalar * e1_x
-    proj_e1_y = proj_e1_scalar * e1_y
-    
-    # Project v onto e2: v_dot_e2 = (v·e2) / |e2|²
-    e2_dot_e2 = e2_x**2 + e2_y**2
-    v_dot_e2 = vector_x * e2_x + vector_y * e2_y
-    proj_e2_scalar = v_dot_e2 / e2_dot_e2
-    proj_e2_x = proj_e2_scalar * e2_x
-    proj_e2_y = proj_e2_scalar * e2_y
+    # Perpendicular projections of v onto e1 and e2
+    proj_e1_x, proj_e1_y = data['proj_e1']
+    proj_e2_x, proj_e2_y = data['proj_e2']
     
     # Draw perpendicular lines from vector tip to projection points
     ax2.plot([vector_x, proj_e1_x], [vector_y, proj_e1_y], 'b--', lw=2.5, alpha=0.8)
@@ -299,8 +476,7 @@ def visualize_tensor_indices():
     draw_right_angle(ax2, [vector_x, vector_y], [proj_e2_x, proj_e2_y], [0, 0], size=0.15, color='red')
     
     # Show covariant component values
-    v1_cov = v_dot_e1
-    v2_cov = v_dot_e2
+    v1_cov, v2_cov = data['covariant']
     
     # Labels for covariant components
     ax2.text(proj_e1_x/2, proj_e1_y/2 - 0.35, f'$v_1 = {v1_cov:.2f}$', fontsize=11, fontweight='bold', color='blue', bbox=dict(boxstyle='round,pad=0.3', fc='white', alpha=0.9))
@@ -344,41 +520,36 @@ def visualize_tensor_indices():
     ax3.text(0.5, 0.05, 'Contraction: $v^\\mu w_\\mu = $ scalar', ha='center', fontsize=12, fontweight='bold',
              bbox=dict(boxstyle='round,pad=0.5', fc='yellow', ec='orange', lw=2.5), transform=ax3.transAxes)
     
-    plt.tight_layout()
-    plt.savefig('visualizations/04_tensor_indices.png', dpi=200, bbox_inches='tight')
-    print("✓ Saved: 04_tensor_indices.png")
-    plt.close()
+    return _finish_figure(fig)
+
+
+def visualize_gravitational_waves(n=200, n_particles=12, m1=30.0, m2=30.0):
+    """Visualize gravitational waves from a compact-binary inspiral."""
+    import figuredata
+
+    return draw_gravitational_waves(figure_data(figuredata.gravitational_waves, n=n,
+                                                n_particles=n_particles, m1=m1, m2=m2))
 
 
-def visualize_gravitational_waves():
-    """Visualize gravitational waves."""
+def draw_gravitational_waves(data):
+    """Render the gravitational waves figure from `figuredata.gravitational_waves` output."""
+    import matplotlib.pyplot as plt
+
     fig, axes = plt.subplots(1, 2, figsize=(14, 5))
     
-    # Wave propagation
+    # Wave propagation: the 3.5PN TaylorF2 chirp h+(t - x) over the last 0.3 s
     ax1 = axes[0]
-    x, t = np.linspace(-5, 5, 80), np.linspace(0, 10, 80)
-    X, T = np.meshgrid(x, t)
-    Z = 0.5 * np.sin(2 * (T - X))
     
-    contour = ax1.contourf(X, T, Z, levels=15, cmap='coolwarm', alpha=0.8)
-    fig.colorbar(contour, ax=ax1, label='Strain $h$')
-    ax1.set_xlabel('Space')
-    ax1.set_ylabel('Time')
-    ax1.set_title('Wave Propagation', fontweight='bold')
+    contour = ax1.contourf(data['x'], data['t'], data['Z'], levels=15, cmap='coolwarm', alpha=0.8)
+    fig.colorbar(contour, ax=ax1, label='Strain $h_+$ (normalized)')
+    ax1.set_xlabel('Space (light-ms)')
+    ax1.set_ylabel('Time to merger (s)')
+    ax1.set_title(f"Inspiral Chirp ({data['m1']:g}+{data['m2']:g} $M_\\odot$, 3.5PN)", fontweight='bold')
     
     # Polarization effect
     ax2 = axes[1]
-    n_particles = 12
-    theta = np.linspace(0, 2*np.pi, n_particles, endpoint=False)
-    r0 = 1
-    x0, y0 = r0 * np.cos(theta), r0 * np.sin(theta)
-    
-    times = [0, 0.5]
-    for i, t in enumerate(times):
-        h_plus = 0.3 * np.cos(t * np.pi)
-        x = x0 * (1 + h_plus)
-        y = y0 * (1 - h_plus)
-        ax2.plot(x, y, 'o-', lw=2, ms=6, label=f't = {t}T')
+    for t, x, y in zip(data['times'], data['ring_x'], data['ring_y']):
+        ax2.plot(x, y, 'o-', lw=2, ms=6, label=f't = {t:g}T')
     
     ax2.plot(0, 0, 'r*', ms=15)
     ax2.set_xlim(-1.5, 1.5)
@@ -388,30 +559,32 @@ def visualize_gravitational_waves():
     ax2.set_title('Plus Polarization $h_+$', fontweight='bold')
     ax2.legend()
     
-    plt.tight_layout()
-    plt.savefig('visualizations/05_gravitational_waves.png', dpi=300, bbox_inches='tight')
-    print("✓ Saved: 05_gravitational_waves.png")
-    plt.close()
+    return _finish_figure(fig)
+
+
+def visualize_geodesics(n_orbit=200, n_precession=300, M=0.02):
+    """Visualize orbital geodesics, integrated in the Schwarzschild metric."""
+    import figuredata
+
+    return draw_geodesics(figure_data(figuredata.geodesic_orbits, n_orbit=n_orbit,
+                                      n_precession=n_precession, M=M))
+
 
+def draw_geodesics(data):
+    """Render the geodesics figure from `figuredata.geodesic_orbits` output."""
+    import matplotlib.pyplot as plt
 
-def visualize_geodesics():
-    """Visualize orbital geodesics."""
     fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+    x, y = data['x'], data['y']
     
     # Orbital paths
     ax1 = axes[0]
     circle = plt.Circle((0, 0), 0.3, color='gold', ec='orange', lw=2)
     ax1.add_patch(circle)
     
-    theta = np.linspace(0, 2*np.pi, 100)
-    ax1.plot(3*np.cos(theta), 3*np.sin(theta), 'b-', lw=2, label='Circular')
-    ax1.plot(4*np.cos(theta), 2.5*np.sin(theta), 'g-', lw=2, label='Elliptical')
-    
-    t = np.linspace(-2, 2, 100)
-    x_hyp = 2 * np.cosh(t)
-    y_hyp = 2 * np.sinh(t)
-    mask = x_hyp < 8
-    ax1.plot(x_hyp[mask], y_hyp[mask], 'r-', lw=2, label='Hyperbolic')
+    ax1.plot(x[:, 0], y[:, 0], 'b-', lw=2, label='Circular')
+    ax1.plot(x[:, 1], y[:, 1], 'g-', lw=2, label='Elliptical')
+    ax1.plot(x[:, 2], y[:, 2], 'r-', lw=2, label='Hyperbolic')
     
     ax1.set_xlim(-8, 8)
     ax1.set_ylim(-6, 6)
@@ -425,14 +598,9 @@ def visualize_geodesics():
     circle2 = plt.Circle((0, 0), 0.3, color='gold', ec='orange', lw=2)
     ax2.add_patch(circle2)
     
-    theta_n = np.linspace(0, 4*np.pi, 300)
-    a_n, e_n = 4, 0.6
-    r_n = a_n * (1 - e_n**2) / (1 + e_n * np.cos(theta_n))
-    ax2.plot(r_n * np.cos(theta_n), r_n * np.sin(theta_n), 'b--', lw=2, label='Newton', alpha=0.6)
-    
-    theta_e = theta_n + 0.15 * theta_n / (2*np.pi)
-    r_e = a_n * (1 - e_n**2) / (1 + e_n * np.cos(theta_n))
-    ax2.plot(r_e * np.cos(theta_e), r_e * np.sin(theta_e), 'r-', lw=3, label='Einstein (precessing)', alpha=0.8)
+    ax2.plot(data['x_newton'], data['y_newton'], 'b--', lw=2, label='Newton', alpha=0.6)
+    ax2.plot(data['x_einstein'], data['y_einstein'], 'r-', lw=3,
+             label=f"Einstein (precessing {data['shift_deg']:.1f}°/orbit)", alpha=0.8)
     
     ax2.set_xlim(-8, 8)
     ax2.set_ylim(-8, 8)
@@ -441,46 +609,508 @@ def visualize_geodesics():
     ax2.legend()
     ax2.set_title('Orbital Precession', fontweight='bold')
     
-    plt.tight_layout()
-    plt.savefig('visualizations/06_geodesics.png', dpi=200, bbox_inches='tight')
-    print("✓ Saved: 06_geodesics.png")
-    plt.close()
+    return _finish_figure(fig)
+
+
+# A figure: command-line key, title, function, output file name, the
+# sample-count parameters that profiles scale, and its native dpi.
+Figure = namedtuple('Figure', 'key title func output samples dpi')
+
+FIGURES = [
+    Figure('spacetime_curvature', "Spacetime Curvature", visualize_spacetime_curvature,
+           '01_spacetime_curvature.png', {'n': 80, 'n_radial': 150, 'n_slice': 300}, 200),
+    Figure('light_bending', "Light Bending", visualize_light_bending,
+           '02_light_bending.png', {'n_samples': 150, 'image_size': 400}, 200),
+    Figure('metric_tensor', "Metric Tensor Components", visualize_metric_tensor,
+           '03_metric_tensor.png', {'n': 150}, 200),
+    Figure('tensor_indices', "Tensor Indices", visualize_tensor_indices,
+           '04_tensor_indices.png', {}, 200),
+    Figure('gravitational_waves', "Gravitational Waves", visualize_gravitational_waves,
+           '05_gravitational_waves.png', {'n': 200}, 300),
+    Figure('geodesics', "Geodesics", visualize_geodesics,
+           '06_geodesics.png', {'n_orbit': 200, 'n_precession': 300}, 200),
+    Figure('curvature_tensors', "Curvature Tensors", visualize_curvature_tensors,
+           '07_curvature_tensors.png', {}, 200),
+]
+
+# Quality profiles: sample counts are multiplied by `samples`; `dpi`
+# replaces every figure's native dpi (None keeps it).
+Profile = namedtuple('Profile', 'samples dpi')
+
+PROFILES = {
+    'preview': Profile(0.5, 72),
+    'web': Profile(1.0, None),
+    'print': Profile(2.0, 300),
+}
+DEFAULT_PROFILE = 'web'
+
+
+def output_dir(profile):
+    """Where a profile's images go: OUTPUT_DIR for the default, a subdirectory otherwise."""
+    return OUTPUT_DIR if profile == DEFAULT_PROFILE else os.path.join(OUTPUT_DIR, profile)
+
+
+MANIFEST_PATH = 'visualizations/.cache-manifest.json'
+REPORT_PATH = 'visualizations/render-report.json'
+PROFILE_DIR = 'visualizations/profiles'
+_PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _is_project_file(path):
+    """True if `path` is a source file of this project (not a library)."""
+    return bool(path) and os.path.dirname(os.path.abspath(path)) == _PROJECT_DIR
 
 
-def main():
+def _code_names(code):
+    """Global names referenced by a code object and any functions nested in it."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _code_names(const)
+    return names
+
+
+def _module_sources(name, path, seen):
+    """Source text of a project module and of the project modules it imports."""
+    import re
+
+    if name in seen:
+        return []
+    seen.add(name)
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    sources = [(name, source)]
+    # `import x, y` and `from x import ...`, at any indentation
+    imported = set()
+    for line in re.findall(r'^[ \t]*(?:import|from)[ \t]+([\w., \t]+)', source, re.MULTILINE):
+        imported.update(dep.split()[0] for dep in line.split(' import')[0].split(',') if dep.strip())
+    for dep in sorted(imported):
+        dep_path = os.path.join(_PROJECT_DIR, f"{dep}.py")
+        if os.path.exists(dep_path):
+            sources.extend(_module_sources(dep, dep_path, seen))
+    return sources
+
+
+def _is_constant(obj):
+    """True for plain data (numbers, strings, types and containers of them) with a stable repr."""
+    if isinstance(obj, (bool, int, float, complex, str, bytes, type(None), type)):
+        return True
+    if isinstance(obj, (tuple, list, frozenset, set)):
+        return all(_is_constant(item) for item in obj)
+    if isinstance(obj, dict):
+        return all(_is_constant(k) and _is_constant(v) for k, v in obj.items())
+    return False
+
+
+def _dependency_sources(func, seen):
+    """Source text of `func` plus the project functions and modules it uses."""
+    key = f"{os.path.basename(inspect.getsourcefile(func))}:{func.__qualname__}"
+    if key in seen:
+        return []
+    seen.add(key)
+    sources = [(key, inspect.getsource(func))]
+    for name in sorted(_code_names(func.__code__)):
+        obj = func.__globals__.get(name)
+        module_path = os.path.join(_PROJECT_DIR, f"{name}.py")
+        if inspect.ismodule(obj):
+            module_path = getattr(obj, '__file__', None)
+        if obj is None or inspect.ismodule(obj):
+            # project modules, whether imported globally or inside the function
+            if _is_project_file(module_path) and os.path.exists(module_path):
+                sources.extend(_module_sources(name, module_path, seen))
+        elif not name.startswith('_') and _is_constant(obj) and f"{func.__module__}.{name}" not in seen:
+            # public module-level settings it reads, e.g. STYLE or SURFACE_FACES
+            # (private names are runtime state such as caches)
+            seen.add(f"{func.__module__}.{name}")
+            sources.append((f"{func.__module__}.{name}", repr(obj)))
+        elif inspect.isfunction(obj) and _is_project_file(inspect.getsourcefile(obj)):
+            sources.extend(_dependency_sources(obj, seen))
+    return sources
+
+
+def figure_params(figure, profile=DEFAULT_PROFILE, overrides=None):
+    """The keyword parameters (grid sizes, r_s, dpi, ...) a figure renders with.
+
+    The function's defaults, with the registered sample counts scaled and
+    the dpi set by `profile`. `overrides` (e.g. {'surface': 'raster'})
+    replace the defaults of the figures whose function takes them.
+    """
+    scale, dpi = PROFILES[profile]
+    params = {name: p.default for name, p in inspect.signature(figure.func).parameters.items()
+              if p.default is not inspect.Parameter.empty}
+    params.update({name: max(2, round(n * scale)) for name, n in figure.samples.items()})
+    params.update({name: value for name, value in (overrides or {}).items() if name in params})
+    params['dpi'] = dpi or figure.dpi
+    return params
+
+
+def _library_versions():
+    """Installed matplotlib and numpy versions, read without importing them."""
+    import importlib.metadata
+
+    return {name: importlib.metadata.version(name) for name in ('matplotlib', 'numpy')}
+
+
+def figure_cache_key(func, params):
+    """Content-addressed key for one figure's output.
+
+    Covers the figure's source and the render and export code (and the
+    project code they call, with the module-level settings they read such
+    as STYLE), its parameters, and the matplotlib/numpy versions that
+    rasterise it.
+    """
+    digest = hashlib.sha256()
+    seen = set()
+    sources = []
+    for entry in (func, render_figure, export_figure, _run_figures):
+        sources += _dependency_sources(entry, seen)
+    for name, source in sources:
+        digest.update(name.encode())
+        digest.update(source.encode())
+    digest.update(json.dumps(params, sort_keys=True, default=repr).encode())
+    digest.update(json.dumps(_library_versions(), sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def _load_manifest(path):
+    try:
+        with open(path) as f:
+            return json.load(f).get('figures', {})
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(path, entries):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({'version': 1, 'figures': entries}, f, indent=2, sort_keys=True)
+
+
+def _init_worker(data_cache=True):
+    """Switch a render process to the non-interactive Agg backend and set up its data cache.
+
+    Runs in pool workers only; in-process renders (jobs=1) keep the
+    caller's backend, and the command line selects Agg itself.
+    """
+    import matplotlib
+
+    matplotlib.use('Agg')
+    set_data_cache(data_cache)
+
+
+def _fit_dpi(fig, size):
+    """The dpi at which the tight-cropped figure fits in `size` = (width, height) pixels."""
+    import matplotlib
+
+    bbox = fig.get_tightbbox(fig.canvas.get_renderer())
+    pad = 2 * matplotlib.rcParams['savefig.pad_inches']
+    return min(px / (inches + pad) for px, inches in zip(size, (bbox.width, bbox.height)) if px)
+
+
+def export_figure(fig, fmt='png', dpi=200, size=None, max_pixels=None):
+    """Encode a finished figure in memory and close it; returns (data, metadata).
+
+    `fmt` is one of FORMATS. `size` = (width, height) in pixels, either of
+    which may be None, replaces `dpi` by the dpi at which the tight-cropped
+    image fits inside it. With `max_pixels`, a figure whose size at that
+    dpi exceeds it raises ValueError before anything is rasterised.
+    metadata has the format, MIME type, dpi, byte count and, for raster
+    formats, the pixel width and height.
+    """
+    import io
+
+    import matplotlib.pyplot as plt
+
+    if fmt not in FORMATS:
+        raise ValueError(f"unsupported format {fmt!r} (choose from {', '.join(FORMATS)})")
+    buffer = io.BytesIO()
+    try:
+        if size and any(size):
+            dpi = _fit_dpi(fig, size)
+        if max_pixels:
+            width, height = fig.get_size_inches() * dpi
+            if width * height > max_pixels:
+                raise ValueError(f"{width:.0f}x{height:.0f} pixels at dpi {dpi:g} exceeds the "
+                                 f"{max_pixels / 1e6:g} Mpx limit")
+        with profiling.phase('savefig'):
+            fig.savefig(buffer, format=fmt, dpi=dpi, bbox_inches='tight')
+    finally:
+        plt.close(fig)
+    data = buffer.getvalue()
+
+    width = height = None
+    if fmt in ('png', 'webp'):
+        from PIL import Image
+
+        width, height = Image.open(io.BytesIO(data)).size
+    return data, {'format': fmt, 'mime': FORMATS[fmt], 'dpi': dpi, 'bytes': len(data),
+                  'width': width, 'height': height}
+
+
+def render_figure(figure, params=None, fmt='png', size=None, profile=DEFAULT_PROFILE,
+                  max_pixels=None):
+    """Render a registered figure to bytes; returns (data, metadata).
+
+    Parameters are `figure_params(figure, profile)` updated with `params`
+    (which may set 'dpi'); `fmt`, `size` and `max_pixels` are passed to
+    `export_figure`.
+    metadata also records the figure key and the parameters used.
+    """
+    import matplotlib.pyplot as plt
+
+    params = {**figure_params(figure, profile), **(params or {})}
+    dpi = params.pop('dpi')
+    with plt.rc_context(STYLE):
+        data, metadata = export_figure(figure.func(**params), fmt, dpi, size, max_pixels)
+    metadata.update(key=figure.key, params=params)
+    return data, metadata
+
+
+def _render_figure(figure, params, path, trace_memory=False, profile=None):
+    """Render one figure with `params` and write it to `path`.
+
+    Runs under `profiling.record`; returns (elapsed seconds, error or None,
+    per-phase metrics dict).
+    """
+    import matplotlib.pyplot as plt
+
+    start = time.perf_counter()
+    error = None
+    with profiling.record(trace_memory, profile) as recorder:
+        try:
+            data, _ = render_figure(figure, params, fmt=os.path.splitext(path)[1][1:])
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(data)
+            print(f"✓ Saved: {figure.output}")
+        except Exception as e:
+            plt.close('all')
+            error = f"{type(e).__name__}: {e}"
+    return time.perf_counter() - start, error, recorder.report()
+
+
+def _run_figures(tasks, jobs, trace_memory=False, profile_dir=None, data_cache=True):
+    """Render (figure, params, path) tasks on `jobs` workers.
+
+    Returns {key: (elapsed, error, metrics)}. With `profile_dir`, each
+    figure's cProfile stats go to <profile_dir>/<output stem>.prof.
+    `data_cache` turns the on-disk figure data cache on or off.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    if profile_dir:
+        os.makedirs(profile_dir, exist_ok=True)
+
+    def args(figure, params, path):
+        profile = None
+        if profile_dir:
+            profile = os.path.join(profile_dir, f"{os.path.splitext(figure.output)[0]}.prof")
+        return figure, params, path, trace_memory, profile
+
+    results = {}
+    if jobs <= 1 or len(tasks) <= 1:
+        set_data_cache(data_cache)
+        for i, task in enumerate(tasks, 1):
+            print(f"\n[{i}/{len(tasks)}] Creating: {task[0].title}")
+            results[task[0].key] = _render_figure(*args(*task))
+    else:
+        jobs = min(jobs, len(tasks))
+        print(f"\nRendering {len(tasks)} figures on {jobs} workers")
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(data_cache,)) as pool:
+            futures = {pool.submit(_render_figure, *args(*task)): task[0].key for task in tasks}
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    results[key] = future.result()
+                except Exception as e:  # worker died (e.g. BrokenProcessPool)
+                    results[key] = (0.0, f"{type(e).__name__}: {e}", None)
+    return results
+
+
+def render_figures(figures, profile=DEFAULT_PROFILE, jobs=1, force=False,
+                   manifest_path=MANIFEST_PATH, trace_memory=False, profile_dir=None,
+                   data_cache=True, overrides=None):
+    """Render registered figures whose inputs changed since the last run.
+
+    Each figure renders with `figure_params(figure, profile, overrides)` into
+    `output_dir(profile)`. A figure is skipped when its output exists and
+    its cache key matches the manifest, unless `force` is set. Rebuilt
+    figures run isolated from each other on `jobs` worker processes: an
+    exception (or a crashed worker) is recorded for that figure and the
+    rest keep rendering. Returns (figure, path, status, elapsed seconds,
+    error or None, metrics or None) tuples in input order, with status one
+    of 'rebuilt', 'cached' or 'failed' and metrics the figure's
+    `profiling` report. Rebuilt figures reuse memoized data (see
+    `figure_data`) unless `data_cache` is False.
+    """
+    manifest = _load_manifest(manifest_path)
+    directory = output_dir(profile)
+    params = {f.key: figure_params(f, profile, overrides) for f in figures}
+    keys = {f.key: figure_cache_key(f.func, params[f.key]) for f in figures}
+    paths = {f.key: os.path.join(directory, f.output) for f in figures}
+    pending = [(f, params[f.key], paths[f.key]) for f in figures
+               if force or manifest.get(paths[f.key]) != keys[f.key] or not os.path.exists(paths[f.key])]
+    results = _run_figures(pending, jobs, trace_memory, profile_dir, data_cache)
+
+    report = []
+    for figure in figures:
+        path = paths[figure.key]
+        if figure.key not in results:
+            report.append((figure, path, 'cached', 0.0, None, None))
+            continue
+        elapsed, error, metrics = results[figure.key]
+        if error:
+            print(f"✗ Error creating {figure.title}: {error}")
+            manifest.pop(path, None)
+        else:
+            manifest[path] = keys[figure.key]
+        report.append((figure, path, 'failed' if error else 'rebuilt', elapsed, error, metrics))
+    _save_manifest(manifest_path, manifest)
+    return report
+
+
+def write_report(path, report, total, jobs, profile=DEFAULT_PROFILE, overrides=None):
+    """Write a render report as JSON: run totals plus per-figure phase metrics."""
+    figures = {}
+    for figure, output, status, elapsed, error, metrics in report:
+        figures[figure.key] = {'title': figure.title, 'output': output, 'status': status,
+                               'params': figure_params(figure, profile, overrides), 'elapsed': elapsed,
+                               'error': error, 'metrics': metrics}
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({'version': 1, 'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                   'profile': profile, 'jobs': jobs, 'wall': total,
+                   'peak_rss_mb': profiling.peak_rss_mb(), 'libraries': _library_versions(),
+                   'figures': figures}, f, indent=2)
+
+
+def select_figures(figures, names):
+    """The registered figures matching `names` (all if empty).
+
+    A figure matches by key (spacetime_curvature), output file stem
+    (01_spacetime_curvature) or title, case-insensitively, with '-' and '_'
+    interchangeable. Raises ValueError listing any names that match nothing.
+    """
+    if not names:
+        return list(figures)
+
+    def norm(text):
+        return text.lower().replace('-', '_').replace(' ', '_')
+
+    wanted = {norm(n): n for n in names}
+    selected, matched = [], set()
+    for figure in figures:
+        aliases = {norm(figure.key), norm(figure.title), norm(os.path.splitext(figure.output)[0])}
+        hits = aliases & wanted.keys()
+        if hits:
+            selected.append(figure)
+            matched |= hits
+    unknown = [wanted[n] for n in wanted if n not in matched]
+    if unknown:
+        raise ValueError(f"unknown figure(s): {', '.join(unknown)}")
+    return selected
+
+
+def main(argv=None):
     """Generate all visualizations."""
+    parser = argparse.ArgumentParser(description="Generate General Relativity visualizations.")
+    parser.add_argument('figures', nargs='*', metavar='FIGURE',
+                        help="figures to render, by name (see --list); default: all")
+    parser.add_argument('--list', action='store_true', help="list the figures and exit")
+    parser.add_argument('-q', '--quality', choices=list(PROFILES), default=DEFAULT_PROFILE,
+                        help=f"quality profile (default: {DEFAULT_PROFILE}); "
+                             f"non-default profiles render into {OUTPUT_DIR}/<profile>/")
+    parser.add_argument('--surface', choices=('mesh', 'raster'),
+                        help="draw the rubber-sheet well as a thinned 3D mesh (the default) or, "
+                             "for large meshes, as a shaded raster image")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help="number of worker processes (default: number of CPUs)")
+    parser.add_argument('-f', '--force', action='store_true',
+                        help="rebuild every figure, ignoring the cache manifest")
+    parser.add_argument('--report', default=REPORT_PATH,
+                        help=f"JSON timing/memory report (default: {REPORT_PATH})")
+    parser.add_argument('--no-data-cache', action='store_true',
+                        help=f"recompute figure data instead of reusing {DATA_CACHE_DIR}/")
+    parser.add_argument('--no-validate', action='store_true',
+                        help="skip the numerical checks of the README's examples (validation.py)")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="record per-phase tracemalloc peaks (slower)")
+    parser.add_argument('--profile', nargs='?', const=PROFILE_DIR, metavar='DIR',
+                        help=f"rebuild every figure under cProfile, one .prof per figure "
+                             f"(default DIR: {PROFILE_DIR})")
+    args = parser.parse_args(argv)
+    overrides = {'surface': args.surface} if args.surface else {}
+
+    if args.list:
+        for figure in FIGURES:
+            params = figure_params(figure, args.quality, overrides)
+            shown = [*figure.samples, *(k for k in overrides if k in params)]
+            samples = ", ".join(f"{k}={params[k]}" for k in shown)
+            print(f"{figure.key:<22} {figure.output:<30} dpi={params['dpi']:<4} {samples}".rstrip())
+        return 0
+    try:
+        figures = select_figures(FIGURES, args.figures)
+    except ValueError as e:
+        parser.error(str(e))
+
     print("=" * 60)
-    print("Generating General Relativity Visualizations")
+    print(f"Generating General Relativity Visualizations ({args.quality})")
     print("=" * 60)
     
-    visualizations = [
-        ("Spacetime Curvature", visualize_spacetime_curvature),
-        ("Light Bending", visualize_light_bending),
-        ("Metric Tensor Components", visualize_metric_tensor),
-        ("Tensor Indices", visualize_tensor_indices),
-        ("Gravitational Waves", visualize_gravitational_waves),
-        ("Geodesics", visualize_geodesics),
-    ]
-    
-    for i, (name, func) in enumerate(visualizations, 1):
-        print(f"\n[{i}/{len(visualizations)}] Creating: {name}")
-        try:
-            func()
-        except Exception as e:
-            print(f"✗ Error creating {name}: {e}")
+    if not args.no_validate:
+        import validation
+
+        if not validation.validate():
+            print("✗ Not rendering: the README's numbers no longer check out (--no-validate to skip)")
+            return 1
+
+    import matplotlib
+
+    matplotlib.use('Agg')
+    start = time.perf_counter()
+    report = render_figures(figures, args.quality, jobs=args.jobs,
+                            force=args.force or bool(args.profile),
+                            trace_memory=args.trace_memory, profile_dir=args.profile,
+                            data_cache=not args.no_data_cache, overrides=overrides)
+    total = time.perf_counter() - start
+    write_report(args.report, report, total, args.jobs, args.quality, overrides)
     
     print("\n" + "=" * 60)
-    print("✓ All visualizations completed!")
+    failed = sum(1 for _, _, status, *_ in report if status == 'failed')
+    if failed:
+        print(f"✗ {failed} of {len(report)} visualizations failed")
+    else:
+        print("✓ All visualizations completed!")
     print("=" * 60)
-    print("\nVisualization files saved in: visualizations/")
+    for status, heading in [('rebuilt', "Rebuilt"), ('cached', "Cache hits (unchanged)"), ('failed', "Failed")]:
+        rows = [(figure, elapsed, metrics) for figure, _, st, elapsed, _, metrics in report if st == status]
+        if not rows:
+            continue
+        print(f"\n{heading}:")
+        if status == 'rebuilt':
+            print(f"  {'':<28} {'total':>7}" + "".join(f" {p:>8}" for p in profiling.PHASES))
+        for figure, elapsed, metrics in rows:
+            if status == 'cached':
+                print(f"  {figure.title}")
+                continue
+            line = f"  {figure.title:<28} {elapsed:6.2f}s"
+            if status == 'rebuilt':
+                phases = metrics['phases']
+                line += "".join(f" {phases[p]['wall']:7.2f}s" if p in phases else f" {'-':>8}"
+                                for p in profiling.PHASES)
+            print(line)
+    print(f"\n  {'Total (wall)':<28} {total:6.2f}s")
+    print(f"\nReport: {args.report}")
+    if args.profile:
+        print(f"Profiles: {args.profile}/*.prof (python -m pstats <file>)")
+    print(f"\nVisualization files saved in: {output_dir(args.quality)}/")
     print("\nGenerated files:")
-    print("  01_spacetime_curvature.png")
-    print("  02_light_bending.png")
-    print("  03_metric_tensor.png")
-    print("  04_tensor_indices.png")
-    print("  05_gravitational_waves.png")
-    print("  06_geodesics.png")
+    for figure, _, status, *_ in report:
+        if status != 'failed':
+            print(f"  {figure.output}")
+    return 1 if failed else 0
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())